@@ -2,34 +2,23 @@
 
 This file serves as the main entry point for the integration.
 It sets up the coordinator and forwards platform setup to dedicated modules.
-To add new features, simply extend the PLATFORMS tuple - each platform
+To add new features, extend the platform tuples in _platforms.py - each platform
 will automatically route to its corresponding module (e.g., switch.py, button.py).
 """
 
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
+# Re-exported so callers can keep reading the tables from the package
+from ._platforms import (
+    ALL_PLATFORMS as ALL_PLATFORMS,
+    PLATFORMS_BY_DEVICE_TYPE as PLATFORMS_BY_DEVICE_TYPE,
+)
 from .const import DATA_COORDINATOR, DOMAIN, DeviceType
 from .coordinator import DreameMowerCoordinator
 
-# All available platforms
-ALL_PLATFORMS = (
-    Platform.LAWN_MOWER,
-    Platform.VACUUM,  # For hold devices (floor washers)
-    Platform.SENSOR,
-    Platform.CAMERA,
-)
-
-# Platforms per device type
-PLATFORMS_BY_DEVICE_TYPE = {
-    DeviceType.MOWER: (Platform.LAWN_MOWER, Platform.SENSOR, Platform.CAMERA),
-    DeviceType.HOLD: (Platform.VACUUM, Platform.SENSOR),
-    DeviceType.VACUUM: (Platform.VACUUM, Platform.SENSOR),
-}
-
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Dreame Mower/Hold device from a config entry."""
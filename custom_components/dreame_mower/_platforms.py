@@ -0,0 +1,22 @@
+"""Platforms set up for each Dreame device type."""
+
+from __future__ import annotations
+
+from homeassistant.const import Platform
+
+from .const import DeviceType
+
+# All available platforms
+ALL_PLATFORMS = (
+    Platform.LAWN_MOWER,
+    Platform.VACUUM,  # For hold devices (floor washers)
+    Platform.SENSOR,
+    Platform.CAMERA,
+)
+
+# Platforms per device type
+PLATFORMS_BY_DEVICE_TYPE = {
+    DeviceType.MOWER: (Platform.LAWN_MOWER, Platform.SENSOR, Platform.CAMERA),
+    DeviceType.HOLD: (Platform.VACUUM, Platform.SENSOR),
+    DeviceType.VACUUM: (Platform.VACUUM, Platform.SENSOR),
+}
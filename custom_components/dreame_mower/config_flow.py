@@ -43,12 +43,12 @@ ACCOUNT_TITLE_DREAME = "Dreamehome Account"
 ACCOUNT_TITLE_MOVA = "MOVAhome Account"
 
 # Supported models
-DREAME_MODELS = [
+DREAME_MODELS = (
     "dreame.mower.",
     "mova.mower.",
     "dreame.hold.",
     "mova.hold.",
-]
+)
 
 model_map = {
     # Lawn mowers
@@ -190,10 +190,7 @@ class DreameMowerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         if devices:
                             found = list(
                                 filter(
-                                    lambda d: any(
-                                        str(d["model"]).startswith(prefix)
-                                        for prefix in DREAME_MODELS
-                                    ),
+                                    lambda d: str(d["model"]).startswith(DREAME_MODELS),
                                     devices["page"]["records"],
                                 )
                             )
@@ -295,7 +292,7 @@ class DreameMowerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     }
                 )
 
-            if self.model and any(self.model.startswith(prefix) for prefix in DREAME_MODELS):
+            if self.model and self.model.startswith(DREAME_MODELS):
                 if self.name is None:
                     self.name = self.model
                 return await self.async_step_options()
@@ -364,9 +361,9 @@ class DreameMowerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.serial_number = device_info.get("sn", "")  # Serial number never changes
 
         # Determine device type
-        if any(self.model.startswith(prefix) for prefix in MOWER_MODELS):
+        if self.model.startswith(MOWER_MODELS):
             self.device_type = DeviceType.MOWER
-        elif any(self.model.startswith(prefix) for prefix in HOLD_MODELS):
+        elif self.model.startswith(HOLD_MODELS):
             self.device_type = DeviceType.HOLD
         else:
             self.device_type = DeviceType.MOWER  # Default to mower
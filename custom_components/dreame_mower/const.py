@@ -21,7 +21,7 @@ class DeviceType:
     HOLD = "hold"        # Floor washer (handheld)
     VACUUM = "vacuum"    # Robot vacuum (future)
 
-# Supported device model prefixes
-MOWER_MODELS = ["dreame.mower.", "mova.mower."]
-HOLD_MODELS = ["dreame.hold.", "mova.hold."]
-VACUUM_MODELS = ["dreame.vacuum.", "mova.vacuum."]
\ No newline at end of file
+# Supported device model prefixes (tuples, so they can be passed to str.startswith)
+MOWER_MODELS = ("dreame.mower.", "mova.mower.")
+HOLD_MODELS = ("dreame.hold.", "mova.hold.")
+VACUUM_MODELS = ("dreame.vacuum.", "mova.vacuum.")
\ No newline at end of file
@@ -193,7 +193,7 @@ class DreameMowerDevice:
         """
         # Check if this is a hold device (handheld floor washer)
         model = self._cloud_device._model
-        if model and any(model.startswith(prefix) for prefix in HOLD_MODELS):
+        if model and model.startswith(HOLD_MODELS):
             # Use H20-specific status mapping
             from .const import HOLD_STATUS_MAPPING
             return HOLD_STATUS_MAPPING.get(self._status_code, f"Unknown ({self._status_code})")
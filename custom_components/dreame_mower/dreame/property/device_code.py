@@ -431,14 +431,18 @@ MOVA_DEVICE_CODES: Dict[int, DeviceCodeDefinition] = {
 MOVA_DEVICE_CODE_REGISTRY = BASE_DEVICE_CODE_REGISTRY.extend(MOVA_DEVICE_CODES)
 
 
+# Prebuilt registries by model; unlisted models use the base registry
+MODEL_DEVICE_CODE_REGISTRIES: Dict[str, DeviceCodeRegistry] = {
+    "dreame.mower.p2255": A1_DEVICE_CODE_REGISTRY,  # A1
+    "dreame.mower.g2422": A1_DEVICE_CODE_REGISTRY,  # A1 Pro
+    "mova.mower.g2405b": MOVA_DEVICE_CODE_REGISTRY,
+    "mova.mower.g2405c": MOVA_DEVICE_CODE_REGISTRY,
+}
+
+
 def get_device_code_registry(model: str | None = None) -> DeviceCodeRegistry:
     """Get device code registry for specific model."""
     if model is None:
         return BASE_DEVICE_CODE_REGISTRY
 
-    if model in ["dreame.mower.p2255", "dreame.mower.g2422"]:  # A1 and A1 Pro models
-        return A1_DEVICE_CODE_REGISTRY
-    elif model in ["mova.mower.g2405b", "mova.mower.g2405c"]:  # MOVA models
-        return MOVA_DEVICE_CODE_REGISTRY
-    
-    return BASE_DEVICE_CODE_REGISTRY
\ No newline at end of file
+    return MODEL_DEVICE_CODE_REGISTRIES.get(model, BASE_DEVICE_CODE_REGISTRY)
\ No newline at end of file
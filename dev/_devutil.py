@@ -0,0 +1,69 @@
+"""Helpers shared by the dev scripts."""
+
+import queue
+import sys
+import types
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from _fastjson import json_line
+
+# How often buffered messages are appended to the log file
+LOG_FLUSH_INTERVAL = 5.0
+
+_PKG_DIR = Path(__file__).parent.parent / "custom_components" / "dreame_mower"
+
+
+def register_packages():
+    """Register the integration package hierarchy without running its __init__.py files.
+
+    Those pull in Home Assistant; modules such as dreame_mower.dreame.cloud.cloud_base
+    then load through the normal cached importer.
+    """
+    for name, path in (
+        ("dreame_mower", _PKG_DIR),
+        ("dreame_mower.dreame", _PKG_DIR / "dreame"),
+        ("dreame_mower.dreame.cloud", _PKG_DIR / "dreame" / "cloud"),
+    ):
+        pkg = types.ModuleType(name)
+        pkg.__path__ = [str(path)]
+        sys.modules.setdefault(name, pkg)
+
+
+def mount_keepalive_adapter(session: requests.Session, pool_maxsize: int = 4, retry_post: bool = False) -> None:
+    """Reuse keep-alive connections on session, retrying transient gateway errors.
+
+    Size pool_maxsize to at least one connection per worker. POSTs are only
+    retried on connection errors unless retry_post is set, since device actions
+    are not idempotent.
+    """
+    session.mount("https://", HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=None if retry_post else Retry.DEFAULT_ALLOWED_METHODS,
+        ),
+    ))
+    session.headers["Connection"] = "keep-alive"
+
+
+def drain_to_log(pending: queue.Queue[dict[str, Any]], log: BinaryIO) -> int:
+    """Append queued messages to the JSON Lines log; returns how many were written."""
+    count = 0
+    while True:
+        try:
+            entry = pending.get_nowait()
+        except queue.Empty:
+            break
+        log.write(json_line(entry))
+        count += 1
+    if count:
+        log.flush()
+    return count
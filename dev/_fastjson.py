@@ -0,0 +1,38 @@
+"""JSON backend shared by the dev scripts: orjson if installed, else stdlib json.
+
+Both backends write UTF-8 with non-ASCII characters left unescaped.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+loads: Callable[..., Any]
+
+try:
+    import orjson as _orjson  # type: ignore[import-not-found,unused-ignore]
+
+except ImportError:
+    import json as _json
+
+    loads = _json.loads
+
+    def dumps(obj: Any, *, indent: bool = False) -> str:
+        """Serialize obj to a compact (or 2-space indented) str."""
+        if indent:
+            return _json.dumps(obj, indent=2, ensure_ascii=False)
+        return _json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def json_line(obj: Any) -> bytes:
+        """Serialize obj as one newline-terminated JSON Lines record (bytes)."""
+        return (dumps(obj) + "\n").encode("utf-8")
+
+else:
+    loads = _orjson.loads
+
+    def dumps(obj: Any, *, indent: bool = False) -> str:
+        """Serialize obj to a compact (or 2-space indented) str."""
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 if indent else 0).decode()
+
+    def json_line(obj: Any) -> bytes:
+        """Serialize obj as one newline-terminated JSON Lines record (bytes)."""
+        return _orjson.dumps(obj, option=_orjson.OPT_APPEND_NEWLINE)
@@ -4,9 +4,9 @@
 import argparse
 import base64
 import hashlib
-import json
+import operator
 import queue
-import random
+import select
 import socket
 import ssl
 import struct
@@ -15,15 +15,23 @@ import time
 import zlib
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import requests
 
+from _devutil import LOG_FLUSH_INTERVAL, drain_to_log
+from _fastjson import loads
+
 # ============= API STRINGS =============
-DREAME_STRINGS = "H4sICAAAAAAEAGNsb3VkX3N0cmluZ3MuanNvbgBdUltv2jAU/iuoUtEmjZCEljBVPDAQgu0hK5eudJrQwXaIV18y24yyX79jm45tebDPd67f+ZyvVwnXLqGGgWSJY6S+eneV9fJ+gfdidBKb8XUll5+a4nr1A12TkLhdSjCu1pJ1s+Q2uX3fesM/11qxuxYvl62sn6R3rSUBwbq9JE3f+p5kkO56xaDY5Xm/XxT9HaHkZpBVvYIOKrjJd5Cl0EuhGmTQp1Unw6IPYDlpPc0+is2XTDzm0yOZbV7K5+n9o1zk97NmtM6mTw+qLsvJfogFafjQsA7cwaIhwTpm1pyiveOKTrWErhA0RjfMuBOaqMCcepcAV2kjh/Ny2bYE40MQor03oNzWnRBikmGVYbbeOv3MVPsf5MMNWHvUhrYPlhkFMtS0X70BhE5AiD4oh7gbxe/AwdVdHc7QDUOYxKyNzS+j/2D20nB0bHkM7rn2hmPK8w0bn1t7Lh3cMu7qkZcioqjUJULBga9kPzlhaAhu3UPu46rSMVCuxvMItCPeCnsbkPacH/DeV0tNmQjsCK5vL5RwWodo6Z+KKTrWUsIro4oLX+ovL+D5rXytVw6vGkdo419uz9wkEJ1E1vY/PInDRigqorWXYbRnyl1CC0EQ+ARt+C9wUcNV0LAT/oqxVo4hWMXh0DSCk5DY/W5DdrPFY3umo49KaKBrI6KjtDajf3u//QbhJuZXdAMAAA=="
+DREAME_STRINGS = "H4sICAAAAAAEAGNsb3VkX3N0cmluZ3MuanNvbgBdUltv2jAU/iuoUtEmjZCEljBVPDAQgu0hK5eudJrQwXaIV18y24yyX79jm45tebDPd67f+ZyvVwnXLqGGgWSJY6S+eneV9fJ+gfdidBKb8XUll5+a4nr1A12TkLhdSjCu1pJ1s+Q2uX3fesM/11qxuxYvl62sn6R3rSUBwbq9JE3f+p5kkO56xaDY5Xm/XxT9HaHkZpBVvYIOKrjJd5Cl0EuhGmTQp1Unw6IPYDlpPc0+is2XTDzm0yOZbV7K5+n9o1zk97NmtM6mTw+qLsvJfogFafjQsA7cwaIhwTpm1pyiveOKTrQErhA0RjfMuBOaqMCcepcAV2kjh/Ny2bYE40MQor03oNzWnRBikmGVYbbeOv3MVPsf5MMNWHvUhrYPlhkFMtS0X70BhE5AiD4oh7gbxe/AwdVdHc7QDUOYxKyNzS+j/2D20nB0bHkM7rn2hmPK8w0bn1t7Lh3cMu7qkZcioqjUJULBga9kPzlhaAhu3UPu46rSMVCuxvMItCPeCnsbkPacH/DeV0tNmQjsCK5vL5RwWodo6Z+KKTrWUsIro4oLX+ovL+D5rXytVw6vGkdo419uz9wkEJ1E1vY/PInDRigqorWXYbRnyl1CC0EQ+ARt+C9wUcNV0LAT/oqxVo4hWMXh0DSCk5DY/W5DdrPFY3umo49KaKBrI6KjtDajf3u//QbhJuZXdAMAAA=="
+
+
+# Fast accessor for the fields printed per changed property
+_get_spv = operator.itemgetter("siid", "piid", "value")
 
 
 def decode_api_strings(encoded):
-    return json.loads(zlib.decompress(base64.b64decode(encoded), 16 + 32))
+    return loads(zlib.decompress(base64.b64decode(encoded), zlib.MAX_WBITS | 16))
 
 
 class SimpleMQTTClient:
@@ -35,18 +43,20 @@ class SimpleMQTTClient:
         self.username = username
         self.password = password
         self.client_id = client_id
-        self.sock = None
+        self.sock: ssl.SSLSocket | None = None
         self.connected = False
         self.message_callback = None
         self._thread = None
         self._stop = threading.Event()
+        # Socket pair used to wake the receive loop's select() on disconnect
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
 
     def connect(self, message_callback=None):
         self.message_callback = message_callback
         try:
             # Create socket
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.settimeout(10)
+            raw_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            raw_sock.settimeout(10)
 
             # SSL context
             context = ssl.create_default_context()
@@ -54,14 +64,14 @@ class SimpleMQTTClient:
             context.verify_mode = ssl.CERT_NONE
 
             # Wrap with SSL
-            self.sock = context.wrap_socket(self.sock, server_hostname=self.host)
+            self.sock = context.wrap_socket(raw_sock, server_hostname=self.host)
 
             # Connect
             self.sock.connect((self.host, self.port))
 
             # Send CONNECT packet
             connect_packet = self._build_connect_packet()
-            self.sock.send(connect_packet)
+            self.sock.sendall(connect_packet)
 
             # Read CONNACK
             resp = self.sock.recv(1024)
@@ -70,6 +80,9 @@ class SimpleMQTTClient:
 
             self.connected = True
 
+            # Receive loop waits in select(), so the socket can block normally
+            self.sock.settimeout(None)
+
             # Start receive thread
             self._thread = threading.Thread(target=self._receive_loop, daemon=True)
             self._thread.start()
@@ -89,7 +102,7 @@ class SimpleMQTTClient:
         # Variable header
         protocol = b"MQIsdp"
         version = b"\x03"  # MQTT 3.1.1
-        flags = b"\x\xc2"  # Clean session, user/pass
+        flags = b"\xc2"  # Clean session, user/pass
         keepalive = b"\x00\x3c"  # 60 seconds
 
         # Payload
@@ -109,25 +122,37 @@ class SimpleMQTTClient:
         return bytes([packet_type]) + enc_len + payload
 
     def _encode_length(self, length):
-        """Encode MQTT remaining length."""
-        result = b""
+        """Encode MQTT remaining length (at most 4 bytes)."""
+        out = bytearray(4)
+        i = 0
         while True:
-            byte = length % 128
-            length //= 128
-            if length > 0:
+            byte = length & 0x7F
+            length >>= 7
+            if length:
                 byte |= 0x80
-            result += bytes([byte])
-            if length == 0:
-                break
-        return result
+            out[i] = byte
+            i += 1
+            if not length:
+                return bytes(out[:i])
 
     def _receive_loop(self):
         """Receive loop."""
+        sock = self.sock
+        if sock is None:
+            return
+        buf = bytearray(4096)
         while not self._stop.is_set():
             try:
-                data = self.sock.recv(4096)
-                if not data:
+                # Data already decrypted by the SSL layer won't show up in select()
+                if not sock.pending():
+                    readable, _, _ = select.select([sock, self._wakeup_r], [], [], 1.0)
+                    if sock not in readable:
+                        continue
+
+                n = sock.recv_into(buf)
+                if not n:
                     break
+                data = buf[:n]
 
                 # Simple parse - just extract JSON payload
                 try:
@@ -138,14 +163,12 @@ class SimpleMQTTClient:
                         end = data_str.rfind('}') + 1
                         if start >= 0 and end > start:
                             json_str = data_str[start:end]
-                            msg = json.loads(json_str)
+                            msg = loads(json_str)
                             if self.message_callback:
                                 self.message_callback(msg)
                 except:
                     pass
 
-            except socket.timeout:
-                continue
             except Exception as e:
                 if not self._stop.is_set():
                     print(f"Receive error: {e}")
@@ -154,6 +177,14 @@ class SimpleMQTTClient:
     def disconnect(self):
         self._stop.set()
         self.connected = False
+        try:
+            self._wakeup_w.send(b"\0")
+        except OSError:
+            pass
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._wakeup_r.close()
+        self._wakeup_w.close()
         if self.sock:
             try:
                 self.sock.close()
@@ -179,9 +210,12 @@ def main():
     session = requests.Session()
 
     # Login
+    pw_hash = hashlib.new("md5", usedforsecurity=False)
+    pw_hash.update(args.password.encode())
+    pw_hash.update(api_strings[2].encode())
     login_data = (f"{api_strings[12]}{api_strings[14]}"
                  f"{args.username}{api_strings[15]}"
-                 f"{hashlib.md5((args.password + api_strings[2]).encode()).hexdigest()}"
+                 f"{pw_hash.hexdigest()}"
                  f"{api_strings[16]}")
 
     headers = {
@@ -234,10 +268,10 @@ def main():
     print(f"✅ Found device: {device.get('customName', device.get('model'))}")
 
     # Setup MQTT
-    captured = []
+    pending: queue.Queue[dict[str, Any]] = queue.Queue()
 
     def on_message(msg):
-        captured.append({"time": datetime.now().isoformat(), "msg": msg})
+        pending.put_nowait({"time": datetime.now().isoformat(), "msg": msg})
 
         method = msg.get("method", "?")
         if method == "properties_changed":
@@ -245,9 +279,10 @@ def main():
             print(f"\n📨 PROPERTIES_CHANGED ({len(params)} items)")
             for p in params[:5]:
                 if isinstance(p, dict):
-                    siid = p.get("siid", "?")
-                    piid = p.get("piid", "?")
-                    val = p.get("value", "N/A")
+                    try:
+                        siid, piid, val = _get_spv(p)
+                    except KeyError:
+                        siid, piid, val = p.get("siid", "?"), p.get("piid", "?"), p.get("value", "N/A")
                     print(f"  {siid}:{piid} = {val}")
         elif method == "event_occured":
             print(f"\n🎉 EVENT: {msg.get('params', {})}")
@@ -274,22 +309,24 @@ def main():
     print("="*60)
     print(f"⏳ Monitoring for {args.duration} seconds...\n")
 
-    # Monitor
-    try:
-        time.sleep(args.duration)
-    except KeyboardInterrupt:
-        print("\n⚠️  Stopped")
-
-    mqtt.disconnect()
-
-    # Save log
-    log_file = Path(__file__).parent / "logs" / f"monitor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    # Monitor, appending to the log as messages arrive
+    log_file = Path(__file__).parent / "logs" / f"monitor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
     log_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(log_file, "w") as f:
-        json.dump(captured, f, indent=2)
-
-    print(f"\n✅ Captured {len(captured)} messages")
+    captured = 0
+    deadline = time.monotonic() + args.duration
+    with open(log_file, "ab") as log:
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                time.sleep(min(LOG_FLUSH_INTERVAL, remaining))
+                captured += drain_to_log(pending, log)
+        except KeyboardInterrupt:
+            print("\n⚠️  Stopped")
+        finally:
+            mqtt.disconnect()
+            captured += drain_to_log(pending, log)
+
+    print(f"\n✅ Captured {captured} messages")
     print(f"📁 Saved: {log_file}")
 
     return 0
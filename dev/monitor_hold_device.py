@@ -3,54 +3,27 @@
 
 import argparse
 import getpass
-import json
+import operator
+import queue
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
-import importlib.util
+from typing import Any
+
+from _devutil import LOG_FLUSH_INTERVAL, drain_to_log, register_packages
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "custom_components"))
 
-def load_cloud_modules():
-    """Load cloud modules bypassing __init__.py."""
-
-    # Create synthetic module hierarchy
-    sys.modules["dreame_mower"] = type(sys)("dreame_mower")
-    sys.modules["dreame_mower.dreame"] = type(sys)("dreame_mower.dreame")
-    sys.modules["dreame_mower.dreame.cloud"] = type(sys)("dreame_mower.dreame.cloud")
+register_packages()
 
-    # Load const first (cloud_device needs it)
-    spec_const = importlib.util.spec_from_file_location(
-        "dreame_mower.dreame.const",
-        project_root / "custom_components" / "dreame_mower" / "dreame" / "const.py"
-    )
-    const_module = importlib.util.module_from_spec(spec_const)
-    sys.modules["dreame_mower.dreame.const"] = const_module
-    spec_const.loader.exec_module(const_module)
-
-    # Load cloud_base
-    spec_base = importlib.util.spec_from_file_location(
-        "dreame_mower.dreame.cloud.cloud_base",
-        project_root / "custom_components" / "dreame_mower" / "dreame" / "cloud" / "cloud_base.py"
-    )
-    cloud_base = importlib.util.module_from_spec(spec_base)
-    sys.modules["dreame_mower.dreame.cloud.cloud_base"] = cloud_base
-    spec_base.loader.exec_module(cloud_base)
-
-    # Load cloud_device
-    spec_device = importlib.util.spec_from_file_location(
-        "dreame_mower.dreame.cloud.cloud_device",
-        project_root / "custom_components" / "dreame_mower" / "dreame" / "cloud" / "cloud_device.py"
-    )
-    cloud_device = importlib.util.module_from_spec(spec_device)
-    sys.modules["dreame_mower.dreame.cloud.cloud_device"] = cloud_device
-    spec_device.loader.exec_module(cloud_device)
+from dreame_mower.dreame.cloud import cloud_device  # noqa: E402
 
-    return cloud_device
+# Fast accessor for the fields printed per changed property
+_get_spv = operator.itemgetter("siid", "piid", "value")
 
 
 def main():
@@ -71,9 +44,6 @@ def main():
     print(f"\n🔌 Connecting...")
     print(f"📍 Device ID: {args.device_id}\n")
 
-    # Load modules
-    cloud_device = load_cloud_modules()
-
     # Create device
     device = cloud_device.DreameMowerCloudDevice(
         username=args.username,
@@ -90,10 +60,10 @@ def main():
     print("✅ API connected")
 
     # Setup callbacks
-    messages = []
+    pending: queue.Queue[dict[str, Any]] = queue.Queue()
 
     def on_message(data):
-        messages.append({"time": datetime.now().isoformat(), "data": data})
+        pending.put_nowait({"time": datetime.now().isoformat(), "data": data})
         method = data.get("method", "?")
 
         if method == "properties_changed":
@@ -101,7 +71,11 @@ def main():
             print(f"\n📨 PROPERTIES_CHANGED ({len(params)} items)")
             for p in params[:5]:
                 if isinstance(p, dict) and "siid" in p:
-                    print(f"  {p.get('siid')}:{p.get('piid')} = {p.get('value', 'N/A')}")
+                    try:
+                        siid, piid, val = _get_spv(p)
+                    except KeyError:
+                        siid, piid, val = p["siid"], p.get("piid"), p.get("value", "N/A")
+                    print(f"  {siid}:{piid} = {val}")
 
         elif method == "event_occured":
             print(f"\n🎉 EVENT: {data.get('params', {})}")
@@ -129,23 +103,25 @@ def main():
         print("❌ MQTT failed")
         return 1
 
-    # Monitor
-    try:
-        time.sleep(args.duration)
-    except KeyboardInterrupt:
-        print("\n⚠️  Stopped")
-
-    device.disconnect()
-
-    # Save log
+    # Monitor, appending to the log as messages arrive
     log_dir = project_root / "dev" / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / f"hold_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-
-    with open(log_file, "w", encoding="utf-8") as f:
-        json.dump(messages, f, indent=2, ensure_ascii=False)
-
-    print(f"\n✅ Captured {len(messages)} messages")
+    log_file = log_dir / f"hold_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+    captured = 0
+    deadline = time.monotonic() + args.duration
+    with open(log_file, "ab") as log:
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                time.sleep(min(LOG_FLUSH_INTERVAL, remaining))
+                captured += drain_to_log(pending, log)
+        except KeyboardInterrupt:
+            print("\n⚠️  Stopped")
+        finally:
+            device.disconnect()
+            captured += drain_to_log(pending, log)
+
+    print(f"\n✅ Captured {captured} messages")
     print(f"📁 {log_file}")
 
     return 0
@@ -3,16 +3,29 @@
 
 import argparse
 import base64
+import functools
 import hashlib
-import json
 import re
 import time
+from collections import deque
 import zlib
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import requests
 
+from _devutil import mount_keepalive_adapter
+from _fastjson import json_line, loads
+
+# Number of recent state changes kept for the end-of-run summary
+RECENT_CHANGES = 50
+
+
+_DREAME_STRINGS_RE = re.compile(r'DREAME_STRINGS.*?=.*?"([^"]+)"', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=1)
 def load_api_strings():
     """Load API strings from original cloud_base.py file."""
     project_root = Path(__file__).parent.parent
@@ -22,12 +35,29 @@ def load_api_strings():
         content = f.read()
 
     # Extract DREAME_STRINGS using regex
-    match = re.search(r'DREAME_STRINGS.*?=.*?"([^"]+)"', content, re.DOTALL)
+    match = _DREAME_STRINGS_RE.search(content)
     if not match:
         raise ValueError("Could not find DREAME_STRINGS")
 
     encoded = match.group(1)
-    return json.loads(zlib.decompress(base64.b64decode(encoded), zlib.MAX_WBITS | 32))
+    return loads(zlib.decompress(base64.b64decode(encoded), zlib.MAX_WBITS | 32))
+
+
+def conditional_headers(resp):
+    """Build If-None-Match/If-Modified-Since headers from a response's validators."""
+    headers = {}
+    etag = resp.headers.get("ETag")
+    if etag:
+        headers["If-None-Match"] = etag
+    modified = resp.headers.get("Last-Modified")
+    if modified:
+        headers["If-Modified-Since"] = modified
+    return headers
+
+
+def find_device(devices, did, default=None):
+    """Return the device record with the given did, or default."""
+    return next((d for d in devices if d.get("did") == did), default)
 
 
 def main():
@@ -43,27 +73,33 @@ def main():
     # Load API strings from original file
     api_strings = load_api_strings()
 
+    # Password hash is fixed for the run, so compute it once
+    pw_hash = hashlib.md5((args.password + api_strings[2]).encode("utf-8")).hexdigest()
+
     print(f"\n[*] Connecting to Dreame cloud ({args.country})...")
     print(f"[+] Device ID: {args.device_id}")
     print(f"[*] Polling every {args.interval}s for {args.duration}s\n")
 
-    # Setup session
+    # Setup session with a small keep-alive pool so polls reuse the TLS connection;
+    # every request here is a login or read-only query, so retrying POST is safe
     session = requests.Session()
+    mount_keepalive_adapter(session, retry_post=True)
 
     # Login
     login_data = (f"{api_strings[12]}{api_strings[14]}"
                  f"{args.username}{api_strings[15]}"
-                 f"{hashlib.md5((args.password + api_strings[2]).encode()).hexdigest()}"
+                 f"{pw_hash}"
                  f"{api_strings[16]}")
 
-    headers = {
+    # Every request uses the same headers, so set them on the session once
+    session.headers.update({
         "Accept": "*/*",
         "Content-Type": "application/x-www-form-urlencoded",
         "User-Agent": api_strings[11],
-    }
+    })
 
     url = f"https://{args.country}{api_strings[0]}:{api_strings[1]}/app/v1/login"
-    resp = session.post(url, data=login_data, headers=headers, timeout=30)
+    resp = session.post(url, data=login_data, timeout=30)
 
     if resp.status_code != 200 or resp.json().get("code") != 0:
         print("[!] Login failed")
@@ -73,15 +109,13 @@ def main():
 
     # Get devices list to find the device
     dev_url = f"https://{args.country}{api_strings[0]}:{api_strings[1]}/home/roominfo"
-    resp = session.post(dev_url, data=api_strings[19], headers=headers, timeout=30)
+    dev_body = api_strings[19].encode("utf-8")
+    resp = session.post(dev_url, data=dev_body, timeout=30)
     dev_data = resp.json()
+    validators = conditional_headers(resp)
 
     devices = dev_data.get("page", {}).get("records", [])
-    target_device = None
-    for d in devices:
-        if d.get("did") == args.device_id:
-            target_device = d
-            break
+    target_device = find_device(devices, args.device_id)
 
     if not target_device:
         print(f"[!] Device {args.device_id} not found")
@@ -100,81 +134,81 @@ def main():
     print("="*60)
     print()
 
-    # Poll for changes
-    captured = []
-    last_battery = target_device.get('battery')
-    last_status = target_device.get('latestStatus')
+    # Poll for changes, appending each one to the log as it happens
+    log_dir = Path(__file__).parent / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_file = log_dir / f"poll_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    log_fh = open(log_file, "ab")
+
+    captured = 0
+    recent: deque[dict[str, Any]] = deque(maxlen=RECENT_CHANGES)
+    last = (target_device.get('battery'), target_device.get('latestStatus'))
 
     try:
-        start_time = time.time()
+        start_time = time.monotonic()
         poll_count = 0
 
-        while time.time() - start_time < args.duration:
+        while time.monotonic() - start_time < args.duration:
             time.sleep(args.interval)
             poll_count += 1
 
-            # Refresh device list
-            resp = session.post(dev_url, data=api_strings[19], headers=headers, timeout=30)
-            dev_data = resp.json()
+            # Refresh device list; 304 means nothing changed since the last poll
+            resp = session.post(dev_url, data=dev_body, headers=validators, timeout=30)
+            if resp.status_code == 304:
+                continue
+            validators = conditional_headers(resp)
+            dev_data = loads(resp.content)
 
             devices = dev_data.get("page", {}).get("records", [])
-            for d in devices:
-                if d.get("did") == args.device_id:
-                    target_device = d
-                    break
-
-            # Get current state
-            battery = target_device.get('battery')
-            status = target_device.get('latestStatus')
-            online = target_device.get('online')
-
-            # Check for changes
-            changes = []
-            if battery != last_battery:
-                changes.append(f"Battery: {last_battery}% → {battery}%")
-                last_battery = battery
-
-            if status != last_status:
-                changes.append(f"Status: {last_status} → {status}")
-                last_status = status
-
-            if changes:
+            target_device = find_device(devices, args.device_id, target_device)
+
+            # Get current state; nothing to format unless it changed
+            curr = (target_device.get('battery'), target_device.get('latestStatus'))
+            if curr != last:
+                battery, status = curr
+                last_battery, last_status = last
+                last = curr
+
+                changes = []
+                if battery != last_battery:
+                    changes.append(f"Battery: {last_battery}% → {battery}%")
+                if status != last_status:
+                    changes.append(f"Status: {last_status} → {status}")
+
                 timestamp = datetime.now().strftime("%H:%M:%S")
                 print(f"[{timestamp}] {' | '.join(changes)}")
 
                 # Capture
-                captured.append({
+                record = {
                     "time": datetime.now().isoformat(),
                     "battery": battery,
                     "status": status,
-                    "online": online,
+                    "online": target_device.get('online'),
                     "raw": target_device
-                })
+                }
+                log_fh.write(json_line(record))
+                log_fh.flush()
+                captured += 1
+                recent.append(record)
 
     except KeyboardInterrupt:
         print("\n[WARN]  Stopped by user")
+    finally:
+        log_fh.close()
 
     # Summary
     print()
     print("="*60)
     print(f"[+] Polled {poll_count} times")
-    print(f"[STAT] Captured {len(captured)} state changes")
+    print(f"[STAT] Captured {captured} state changes")
     print()
 
-    # Save log
-    log_dir = Path(__file__).parent / "logs"
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / f"poll_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-
-    with open(log_file, "w") as f:
-        json.dump(captured, f, indent=2)
-
     print(f"[FILE] Log saved: {log_file}")
 
     # Show status codes seen
-    if captured:
+    if recent:
         print("\n[LIST] Status codes seen:")
-        for c in captured:
+        for c in recent:
             print(f"   Status {c['status']} (Battery: {c['battery']}%) - {c['time']}")
 
     return 0
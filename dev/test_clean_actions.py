@@ -2,95 +2,160 @@
 """Test self-clean actions with correct host info."""
 
 import argparse
-import json
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import requests
+
+from _devutil import mount_keepalive_adapter, register_packages
+from _fastjson import dumps
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import importlib.util
+register_packages()
+
+from dreame_mower.dreame.cloud import cloud_base  # noqa: E402
+
+# Delay each concurrency slot waits after a request before taking the next one
+REQUEST_DELAY = 0.5
 
-# Load cloud_base module
-spec = importlib.util.spec_from_file_location(
-    "cloud_base",
-    project_root / "custom_components" / "dreame_mower" / "dreame" / "cloud" / "cloud_base.py"
+# Compact JSON body for an action request; only the fields vary per call
+_ACTION_TEMPLATE = (
+    '{{"did":{did},"id":{id},"data":{{"did":{did},"id":{id},"method":"action",'
+    '"params":{{"did":{did},"siid":{siid},"aiid":{aiid},"in":{params}}}}}}}'
 )
-cloud_base = importlib.util.module_from_spec(spec)
-sys.modules["cloud_base"] = cloud_base
-spec.loader.exec_module(cloud_base)
 
 
-def execute_action(cloud, device_id, host, siid, aiid, params=None, description=""):
-    """Execute a device action with correct host."""
-    api = cloud._api_strings
+# Test actions as (siid, aiid, params, desc)
+# Based on the feature "hold_selfClean_selfCleanDeep", we should test:
+# - siid 6: Self-clean (common for mop cleaning)
+# - siid 7: Drying
+# - siid 5: Main cleaning controls
+# - siid 4: Status/Mode controls
+_TEST_ACTIONS = (
+    # Try different siid values for self-clean
+    (4, 1, (), "Start from siid=4"),
+    (5, 1, (), "Start cleaning (siid=5, aiid=1)"),
+    (5, 2, (), "Stop cleaning (siid=5, aiid=2)"),
+
+    # Self-clean attempts
+    (6, 1, (), "Self-clean (siid=6, aiid=1)"),
+    (6, 2, (), "Self-clean stop (siid=6, aiid=2)"),
+    (6, 3, (), "Self-clean aiid=3"),
+    (6, 4, (), "Self-clean aiid=4"),
+
+    # Self-clean with mode parameters
+    (6, 1, (1,), "Self-clean mode=1 (Normal)"),
+    (6, 1, (2,), "Self-clean mode=2 (Hot)"),
+    (6, 1, (3,), "Self-clean mode=3 (Deep)"),
+
+    # Drying attempts
+    (7, 1, (), "Drying (siid=7, aiid=1)"),
+    (7, 2, (), "Drying stop (siid=7, aiid=2)"),
+    (7, 1, (1,), "Drying mode=1"),
+    (7, 1, (2,), "Drying mode=2"),
+
+    # Try higher siids (some devices use these for dock functions)
+    (16, 1, (), "siid=16, aiid=1"),
+    (17, 1, (), "siid=17, aiid=1"),
+    (18, 1, (), "siid=18, aiid=1"),
+)
 
-    # Build action URL with host prefix
+
+def action_url(cloud, host):
+    """Build the action URL for the device's host (constant for the whole sweep)."""
+    api = cloud._api_strings
     host_prefix = f"-{host.split('.')[0]}" if host else ""
-    url = f"{cloud.get_api_url()}/{api[37]}{host_prefix}/{api[27]}/{api[38]}"
-
-    data = {
-        "did": str(device_id),
-        "id": int(time.time() * 1000),  # Use timestamp as ID
-        "data": {
-            "did": str(device_id),
-            "id": int(time.time() * 1000),
-            "method": "action",
-            "params": {
-                "did": str(device_id),
-                "siid": siid,
-                "aiid": aiid,
-                "in": params or [],
-            }
-        }
-    }
+    return f"{cloud.get_api_url()}/{api[37]}{host_prefix}/{api[27]}/{api[38]}"
 
-    headers = {
-        "Accept": "*/*",
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Accept-Language": "en-US;q=0.8",
-        "Accept-Encoding": "gzip, deflate",
-        api[47]: api[3],  # User-Agent
-        api[49]: api[5],  # Authorization (Basic)
-        api[50]: cloud._ti if cloud._ti else api[6],  # Tenant-Id
-        api[51]: api[52],  # Content-Type: application/json (overrides above!)
-        api[46]: cloud._key,  # Dreame-Auth token
-    }
-    if cloud._country == "cn":
-        headers[api[48]] = api[4]
 
-    print(f"    URL: {url}")
-    print(f"    siid={siid}, aiid={aiid}, params={params}")
+def open_http_client(cloud, concurrency, http2):
+    """Return the client used for actions.
+
+    Defaults to the cloud's requests session; with http2, an httpx client that
+    multiplexes all requests over one connection, carrying the session's cookies.
+    """
+    if not http2:
+        return cloud._session
+    import httpx  # Optional: pip install "httpx[http2]"
+
+    return httpx.Client(
+        http2=True,
+        cookies=cloud._session.cookies,
+        limits=httpx.Limits(max_keepalive_connections=2, max_connections=max(4, concurrency)),
+        timeout=30.0,
+    )
+
+
+def execute_action(client, headers, device_id, url, siid, aiid, params=None, description="", header=""):
+    """Execute a device action against `url`, printing its report as one block."""
+    lines = [header] if header else []
 
     # Serialize data as JSON string (not as JSON object)
-    data_str = json.dumps(data, separators=(",", ":"))
+    data_str = _ACTION_TEMPLATE.format(
+        did=dumps(str(device_id)),
+        id=int(time.time() * 1000),  # Use timestamp as ID
+        siid=siid,
+        aiid=aiid,
+        params=dumps(params or []),
+    )
+
+    lines.append(f"    URL: {url}")
+    lines.append(f"    siid={siid}, aiid={aiid}, params={params}")
 
     try:
-        response = cloud._session.post(url, data=data_str, headers=headers, timeout=30)
+        if isinstance(client, requests.Session):
+            response = client.post(url, data=data_str, headers=headers, timeout=30)
+        else:  # httpx takes raw bodies as content=
+            response = client.post(url, content=data_str, headers=headers)
 
-        print(f"    HTTP Status: {response.status_code}")
+        lines.append(f"    HTTP Status: {response.status_code}")
 
         if response.status_code == 200:
             result = response.json()
-            print(f"    Response code: {result.get('code')}")
+            lines.append(f"    Response code: {result.get('code')}")
 
             if result.get("code") == 0:
-                print(f"    [+] ✓ SUCCESS! {description}")
+                lines.append(f"    [+] ✓ SUCCESS! {description}")
                 return True
             else:
                 msg = result.get('msg', 'Unknown error')
-                print(f"    [-] ✗ Failed: {msg}")
+                lines.append(f"    [-] ✗ Failed: {msg}")
                 return False
         else:
-            print(f"    [!] HTTP Error: {response.text[:100]}")
+            lines.append(f"    [!] HTTP Error: {response.text[:100]}")
             return False
 
     except Exception as ex:
-        print(f"    [!] Exception: {ex}")
+        lines.append(f"    [!] Exception: {ex}")
         return False
 
+    finally:
+        # Print atomically so concurrent actions don't interleave their output
+        print("\n".join(lines))
+
+
+def run_actions(cloud, client, headers, device_id, host, test_actions, concurrency):
+    """Execute the action sweep on `concurrency` worker threads; results keep input order."""
+    total = len(test_actions)
+    url = action_url(cloud, host)
+
+    def run_one(item):
+        i, (siid, aiid, params, desc) = item
+        success = execute_action(
+            client, headers, device_id, url, siid, aiid, params, desc,
+            header=f"\n[{i}/{total}] Testing: {desc}",
+        )
+        time.sleep(REQUEST_DELAY)  # Small delay between requests
+        return success
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(run_one, enumerate(test_actions, 1)))
+
 
 def main():
     parser = argparse.ArgumentParser(description="Test self-clean actions")
@@ -99,6 +164,8 @@ def main():
     parser.add_argument("--country", default="cn")
     parser.add_argument("--account-type", default="dreame", choices=["dreame", "mova"])
     parser.add_argument("--device-id", required=True)
+    parser.add_argument("--concurrency", type=int, default=4, help="Max actions in flight at once")
+    parser.add_argument("--http2", action="store_true", help="Send actions over HTTP/2 (requires httpx[http2])")
     args = parser.parse_args()
 
     # Create cloud client
@@ -117,20 +184,32 @@ def main():
 
     print("[+] Connected!\n")
 
-    api = cloud._api_strings
+    concurrency = max(1, args.concurrency)
 
-    # Get device info
-    print("[*] Getting device info...")
-    url = f"{cloud.get_api_url()}/{api[23]}/{api[24]}/{api[27]}/{api[29]}"
-    data = {"did": args.device_id}
+    mount_keepalive_adapter(cloud._session, pool_maxsize=max(4, concurrency))
 
+    api = cloud._api_strings
+
+    # Every request below sends these headers; they are passed per request so
+    # the auth token never lands on the cloud's shared session
     headers = {
-        "Content-Type": "application/json",
-        api[46]: cloud._key,
+        "Accept": "*/*",
+        "Accept-Language": "en-US;q=0.8",
+        "Accept-Encoding": "gzip, deflate",
+        api[47]: api[3],  # User-Agent
+        api[49]: api[5],  # Authorization (Basic)
+        api[50]: cloud._ti if cloud._ti else api[6],  # Tenant-Id
+        api[51]: api[52],  # Content-Type: application/json
+        api[46]: cloud._key,  # Dreame-Auth token
     }
     if cloud._country == "cn":
         headers[api[48]] = api[4]
 
+    # Get device info
+    print("[*] Getting device info...")
+    url = f"{cloud.get_api_url()}/{api[23]}/{api[24]}/{api[27]}/{api[29]}"
+    data = {"did": args.device_id}
+
     response = cloud._session.post(url, json=data, headers=headers, timeout=30)
 
     if response.status_code != 200 or response.json().get("code") != 0:
@@ -147,69 +226,19 @@ def main():
     print(f"[+] Feature: {feature}")
     print()
 
-    # Test actions
-    # Based on the feature "hold_selfClean_selfCleanDeep", we should test:
-    # - siid 6: Self-clean (common for mop cleaning)
-    # - siid 7: Drying
-    # - siid 5: Main cleaning controls
-    # - siid 4: Status/Mode controls
-
-    test_actions = [
-        # Try different siid values for self-clean
-        {"siid": 4, "aiid": 1, "params": [], "desc": "Start from siid=4"},
-        {"siid": 5, "aiid": 1, "params": [], "desc": "Start cleaning (siid=5, aiid=1)"},
-        {"siid": 5, "aiid": 2, "params": [], "desc": "Stop cleaning (siid=5, aiid=2)"},
-
-        # Self-clean attempts
-        {"siid": 6, "aiid": 1, "params": [], "desc": "Self-clean (siid=6, aiid=1)"},
-        {"siid": 6, "aiid": 2, "params": [], "desc": "Self-clean stop (siid=6, aiid=2)"},
-        {"siid": 6, "aiid": 3, "params": [], "desc": "Self-clean aiid=3"},
-        {"siid": 6, "aiid": 4, "params": [], "desc": "Self-clean aiid=4"},
-
-        # Self-clean with mode parameters
-        {"siid": 6, "aiid": 1, "params": [1], "desc": "Self-clean mode=1 (Normal)"},
-        {"siid": 6, "aiid": 1, "params": [2], "desc": "Self-clean mode=2 (Hot)"},
-        {"siid": 6, "aiid": 1, "params": [3], "desc": "Self-clean mode=3 (Deep)"},
-
-        # Drying attempts
-        {"siid": 7, "aiid": 1, "params": [], "desc": "Drying (siid=7, aiid=1)"},
-        {"siid": 7, "aiid": 2, "params": [], "desc": "Drying stop (siid=7, aiid=2)"},
-        {"siid": 7, "aiid": 1, "params": [1], "desc": "Drying mode=1"},
-        {"siid": 7, "aiid": 1, "params": [2], "desc": "Drying mode=2"},
-
-        # Try higher siids (some devices use these for dock functions)
-        {"siid": 16, "aiid": 1, "params": [], "desc": "siid=16, aiid=1"},
-        {"siid": 17, "aiid": 1, "params": [], "desc": "siid=17, aiid=1"},
-        {"siid": 18, "aiid": 1, "params": [], "desc": "siid=18, aiid=1"},
-    ]
-
     print("="*70)
     print("TESTING ACTIONS")
     print("="*70)
     print("\nNOTE: Error 80001 means device is offline/sleeping.")
     print("      Wake up the device first for accurate testing.\n")
 
-    successful_actions = []
-
-    for i, action in enumerate(test_actions, 1):
-        siid = action["siid"]
-        aiid = action["aiid"]
-        params = action["params"]
-        desc = action["desc"]
-
-        print(f"\n[{i}/{len(test_actions)}] Testing: {desc}")
-
-        success = execute_action(cloud, args.device_id, host, siid, aiid, params, desc)
-
-        if success:
-            successful_actions.append({
-                "siid": siid,
-                "aiid": aiid,
-                "params": params,
-                "desc": desc
-            })
-
-        time.sleep(0.5)  # Small delay between requests
+    client = open_http_client(cloud, concurrency, args.http2)
+    try:
+        results = run_actions(cloud, client, headers, args.device_id, host, _TEST_ACTIONS, concurrency)
+    finally:
+        if client is not cloud._session:
+            client.close()
+    successful_actions = [action for action, success in zip(_TEST_ACTIONS, results) if success]
 
     # Summary
     print("\n" + "="*70)
@@ -218,15 +247,15 @@ def main():
 
     if successful_actions:
         print(f"[+] Found {len(successful_actions)} working actions:\n")
-        for action in successful_actions:
-            print(f"  {action['desc']}")
-            print(f"    ActionIdentifier(siid={action['siid']}, aiid={action['aiid']}, name=\"{action['desc']}\")")
+        for siid, aiid, _params, desc in successful_actions:
+            print(f"  {desc}")
+            print(f"    ActionIdentifier(siid={siid}, aiid={aiid}, name=\"{desc}\")")
             print()
 
         print("Add these to const.py:")
-        for action in successful_actions:
-            name = action['desc'].lower().replace(' ', '_').replace('=', '_').replace(',', '')
-            print(f'  HOLD_ACTION_{name.upper()} = ActionIdentifier(siid={action["siid"]}, aiid={action["aiid"]}, name="{name}")')
+        for siid, aiid, _params, desc in successful_actions:
+            name = desc.lower().replace(' ', '_').replace('=', '_').replace(',', '')
+            print(f'  HOLD_ACTION_{name.upper()} = ActionIdentifier(siid={siid}, aiid={aiid}, name="{name}")')
     else:
         print("[!] No successful actions found.")
         print("\nPossible reasons:")
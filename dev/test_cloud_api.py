@@ -2,24 +2,19 @@
 """Direct API testing for Dreame cloud."""
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
+from _devutil import mount_keepalive_adapter, register_packages
+from _fastjson import dumps, loads
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import importlib.util
+register_packages()
 
-# Load cloud_base module
-spec = importlib.util.spec_from_file_location(
-    "cloud_base",
-    project_root / "custom_components" / "dreame_mower" / "dreame" / "cloud" / "cloud_base.py"
-)
-cloud_base = importlib.util.module_from_spec(spec)
-sys.modules["cloud_base"] = cloud_base
-spec.loader.exec_module(cloud_base)
+from dreame_mower.dreame.cloud import cloud_base  # noqa: E402
 
 
 def main():
@@ -47,8 +42,20 @@ def main():
 
     print("[+] Connected!\n")
 
+    mount_keepalive_adapter(cloud._session)
+
     api = cloud._api_strings
 
+    # Every endpoint below sends these headers; they are passed per request so
+    # the auth token never lands on the cloud's shared session
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": api[3],
+        api[46]: cloud._key,  # Add auth token
+    }
+    if args.country == "cn":
+        headers[api[48]] = api[4]
+
     # Try different API endpoints
     endpoints = [
         # Endpoint format: (path fragment, description, data_builder)
@@ -85,15 +92,7 @@ def main():
             data = data_builder()
 
             print(f"URL: {url}")
-            print(f"Data: {json.dumps(data, ensure_ascii=False)}")
-
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": api[3],
-                api[46]: cloud._key,  # Add auth token
-            }
-            if args.country == "cn":
-                headers[api[48]] = api[4]
+            print(f"Data: {dumps(data)}")
 
             response = cloud._session.post(
                 url,
@@ -105,14 +104,14 @@ def main():
             print(f"\nHTTP Status: {response.status_code}")
 
             if response.status_code == 200:
-                result = response.json()
+                result = loads(response.content)
                 print(f"Response code: {result.get('code')}")
-                print(f"Response: {json.dumps(result, indent=2, ensure_ascii=False)[:1000]}...")
+                print(f"Response: {dumps(result, indent=True)[:1000]}...")
 
                 if result.get("code") == 0:
                     print("\n[+] SUCCESS!")
             else:
-                print(f"[!] HTTP Error: {response.text[:500]}")
+                print(f"[!] HTTP Error: {response.content[:500].decode('utf-8', 'replace')}")
 
         except Exception as ex:
             print(f"[!] Exception: {ex}")
@@ -2,35 +2,74 @@
 """Test device actions using different siid/aiid combinations."""
 
 import argparse
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from _devutil import mount_keepalive_adapter, register_packages
+from _fastjson import loads
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import importlib.util
+register_packages()
+
+from dreame_mower.dreame.cloud import cloud_base  # noqa: E402
+
+
+# Test actions to try, as (siid, aiid, params, name)
+# Based on common MIoT patterns for handheld wet/dry vacuums
+_TEST_ACTIONS = (
+    # Basic cleaning control
+    (5, 1, (), "Start Cleaning"),
+    (5, 2, (), "Stop Cleaning"),
+    (5, 4, (), "Pause Cleaning"),
 
-# Load cloud_base module
-spec = importlib.util.spec_from_file_location(
-    "cloud_base",
-    project_root / "custom_components" / "dreame_mower" / "dreame" / "cloud" / "cloud_base.py"
+    # Self-cleaning (most likely to work)
+    (6, 1, (), "Start Self-Clean"),
+    (6, 2, (), "Stop Self-Clean"),
+
+    # Drying
+    (7, 1, (), "Start Drying"),
+    (7, 2, (), "Stop Drying"),
+
+    # With mode parameters
+    (6, 1, (1,), "Start Self-Clean (Mode=Normal)"),
+    (6, 1, (2,), "Start Self-Clean (Mode=Hot)"),
+    (6, 1, (3,), "Start Self-Clean (Mode=Deep)"),
 )
-cloud_base = importlib.util.module_from_spec(spec)
-sys.modules["cloud_base"] = cloud_base
-spec.loader.exec_module(cloud_base)
 
 
-def execute_action(cloud, device_id, siid, aiid, params=None):
-    """Execute a device action."""
+def action_url(cloud):
+    """Build the action endpoint URL (constant for the whole sweep)."""
     api = cloud._api_strings
 
-    # Build the endpoint for action
     # Based on cloud_device.py send() method
     host = ""
-    url = f"{cloud.get_api_url()}/{api[37]}{host}/{api[27]}/{api[38]}"
+    return f"{cloud.get_api_url()}/{api[37]}{host}/{api[27]}/{api[38]}"
+
 
+def open_http_client(cloud, concurrency, http2):
+    """Return the client used for actions.
+
+    Defaults to the cloud's requests session; with http2, an httpx client that
+    multiplexes all requests over one connection, carrying the session's cookies.
+    """
+    if not http2:
+        return cloud._session
+    import httpx  # Optional: pip install "httpx[http2]"
+
+    return httpx.Client(
+        http2=True,
+        cookies=cloud._session.cookies,
+        limits=httpx.Limits(max_keepalive_connections=2, max_connections=max(4, concurrency)),
+        timeout=30.0,
+    )
+
+
+def execute_action(client, headers, device_id, url, siid, aiid, params=None):
+    """Execute a device action against `url`."""
     data = {
         "did": str(device_id),
         "id": 1,  # Request ID
@@ -42,23 +81,63 @@ def execute_action(cloud, device_id, siid, aiid, params=None):
                 "did": str(device_id),
                 "siid": siid,
                 "aiid": aiid,
-                "in": params or [],
+                "in": list(params or ()),
             }
         }
     }
 
-    headers = {
-        "Content-Type": "application/json",
-        api[46]: cloud._key,
-    }
-    if cloud._country == "cn":
-        headers[api[48]] = api[4]
-
-    response = cloud._session.post(url, json=data, headers=headers, timeout=30)
+    response = client.post(url, json=data, headers=headers, timeout=30)
 
     return response
 
 
+def report_action(client, headers, device_id, url, action):
+    """Execute one action and print its report as a single block."""
+    siid, aiid, params, name = action
+    lines = [
+        f"[*] Action: {name}",
+        f"    siid: {siid}, aiid: {aiid}",
+        f"    params: {list(params)}",
+    ]
+
+    try:
+        response = execute_action(client, headers, device_id, url, siid, aiid, params)
+
+        lines.append(f"    HTTP Status: {response.status_code}")
+
+        if response.status_code == 200:
+            result = loads(response.content)
+            lines.append(f"    Response code: {result.get('code')}")
+
+            if result.get("code") == 0:
+                lines.append(f"    [+] SUCCESS!")
+                if "data" in result and "result" in result["data"]:
+                    lines.append(f"    Result: {result['data']['result']}")
+            else:
+                lines.append(f"    [!] Failed: {result.get('msg', 'Unknown error')}")
+        else:
+            lines.append(f"    [!] HTTP Error: {response.content[:200].decode('utf-8', 'replace')}")
+
+    except Exception as ex:
+        lines.append(f"    [!] Exception: {ex}")
+
+    # Print atomically so concurrent actions don't interleave their output
+    print("\n".join(lines) + "\n")
+
+
+def run_actions(cloud, client, headers, device_id, test_actions, concurrency):
+    """Execute the action sweep on `concurrency` worker threads."""
+    url = action_url(cloud)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(report_action, client, headers, device_id, url, action)
+            for action in test_actions
+        ]
+        # Surface anything report_action didn't catch instead of dropping it
+        for future in as_completed(futures):
+            future.result()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Test device actions")
     parser.add_argument("--username", required=True)
@@ -67,6 +146,8 @@ def main():
     parser.add_argument("--account-type", default="dreame", choices=["dreame", "mova"])
     parser.add_argument("--device-id", required=True)
     parser.add_argument("--dry-run", action="store_true", help="Don't actually execute, just show what would be done")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max actions in flight at once")
+    parser.add_argument("--http2", action="store_true", help="Send actions over HTTP/2 (requires httpx[http2])")
     args = parser.parse_args()
 
     # Create cloud client
@@ -85,68 +166,37 @@ def main():
 
     print("[+] Connected!\n")
 
-    # Test actions to try
-    # Based on common MIoT patterns for handheld wet/dry vacuums
-    test_actions = [
-        # Basic cleaning control
-        {"siid": 5, "aiid": 1, "name": "Start Cleaning", "params": []},
-        {"siid": 5, "aiid": 2, "name": "Stop Cleaning", "params": []},
-        {"siid": 5, "aiid": 4, "name": "Pause Cleaning", "params": []},
-
-        # Self-cleaning (most likely to work)
-        {"siid": 6, "aiid": 1, "name": "Start Self-Clean", "params": []},
-        {"siid": 6, "aiid": 2, "name": "Stop Self-Clean", "params": []},
-
-        # Drying
-        {"siid": 7, "aiid": 1, "name": "Start Drying", "params": []},
-        {"siid": 7, "aiid": 2, "name": "Stop Drying", "params": []},
-
-        # With mode parameters
-        {"siid": 6, "aiid": 1, "name": "Start Self-Clean (Mode=Normal)", "params": [1]},
-        {"siid": 6, "aiid": 1, "name": "Start Self-Clean (Mode=Hot)", "params": [2]},
-        {"siid": 6, "aiid": 1, "name": "Start Self-Clean (Mode=Deep)", "params": [3]},
-    ]
+    concurrency = max(1, args.concurrency)
+
+    mount_keepalive_adapter(cloud._session, pool_maxsize=max(4, concurrency))
+
+    # Every action sends these headers; they are passed per request so the
+    # auth token never lands on the cloud's shared session
+    api = cloud._api_strings
+    headers = {
+        "Content-Type": "application/json",
+        api[46]: cloud._key,
+    }
+    if cloud._country == "cn":
+        headers[api[48]] = api[4]
 
     print("="*60)
     print("TESTING DEVICE ACTIONS")
     print("="*60 + "\n")
 
-    for action in test_actions:
-        siid = action["siid"]
-        aiid = action["aiid"]
-        name = action["name"]
-        params = action["params"]
-
-        print(f"[*] Action: {name}")
-        print(f"    siid: {siid}, aiid: {aiid}")
-        print(f"    params: {params}")
-
-        if args.dry_run:
+    if args.dry_run:
+        for siid, aiid, params, name in _TEST_ACTIONS:
+            print(f"[*] Action: {name}")
+            print(f"    siid: {siid}, aiid: {aiid}")
+            print(f"    params: {list(params)}")
             print("    [DRY RUN - Skipping execution]\n")
-            continue
-
+    else:
+        client = open_http_client(cloud, concurrency, args.http2)
         try:
-            response = execute_action(cloud, args.device_id, siid, aiid, params)
-
-            print(f"    HTTP Status: {response.status_code}")
-
-            if response.status_code == 200:
-                result = response.json()
-                print(f"    Response code: {result.get('code')}")
-
-                if result.get("code") == 0:
-                    print(f"    [+] SUCCESS!")
-                    if "data" in result and "result" in result["data"]:
-                        print(f"    Result: {result['data']['result']}")
-                else:
-                    print(f"    [!] Failed: {result.get('msg', 'Unknown error')}")
-            else:
-                print(f"    [!] HTTP Error: {response.text[:200]}")
-
-        except Exception as ex:
-            print(f"    [!] Exception: {ex}")
-
-        print()
+            run_actions(cloud, client, headers, args.device_id, _TEST_ACTIONS, concurrency)
+        finally:
+            if client is not cloud._session:
+                client.close()
 
     print("="*60)
     print("SUMMARY")
@@ -2,40 +2,14 @@
 """Test different siid/aiid combinations for hold device."""
 
 import sys
-import importlib.util
 from pathlib import Path
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-
-def load_cloud_modules():
-    """Load cloud modules bypassing __init__.py."""
-    # Create synthetic module hierarchy
-    sys.modules["dreame_mower"] = type(sys)("dreame_mower")
-    sys.modules["dreame_mower.dreame"] = type(sys)("dreame_mower.dreame")
-    sys.modules["dreame_mower.dreame.cloud"] = type(sys)("dreame_mower.dreame.cloud")
-
-    # Load const first
-    spec_const = importlib.util.spec_from_file_location(
-        "dreame_mower.dreame.const",
-        project_root / "custom_components" / "dreame_mower" / "dreame" / "const.py"
-    )
-    const_module = importlib.util.module_from_spec(spec_const)
-    sys.modules["dreame_mower.dreame.const"] = const_module
-    spec_const.loader.exec_module(const_module)
-
-    # Load cloud_base
-    spec_base = importlib.util.spec_from_file_location(
-        "dreame_mower.dreame.cloud.cloud_base",
-        project_root / "custom_components" / "dreame_mower" / "dreame" / "cloud" / "cloud_base.py"
-    )
-    cloud_base = importlib.util.module_from_spec(spec_base)
-    sys.modules["dreame_mower.dreame.cloud.cloud_base"] = cloud_base
-    spec_base.loader.exec_module(cloud_base)
-
-    return cloud_base
+# The script also needs cloud_device and const, so import the package normally
+from custom_components.dreame_mower.dreame.cloud import cloud_base  # noqa: E402
 
 
 def test_action(device, siid, aiid, name):
@@ -66,9 +40,6 @@ def main():
     parser.add_argument("--device-id", required=True)
     args = parser.parse_args()
 
-    # Load modules
-    cloud_base = load_cloud_modules()
-
     print(f"\n[*] Connecting to Dreame cloud ({args.country})...")
     print(f"[+] Device ID: {args.device_id}\n")
 
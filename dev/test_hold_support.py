@@ -2,13 +2,8 @@
 """Test script to verify basic hold device support."""
 
 import sys
-import json
 from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
 def test_imports():
     """Test if all modules can be imported."""
     print("[*] Testing imports...")
@@ -55,7 +50,7 @@ def test_device_detection():
     # Check if model starts with any hold prefix
     from custom_components.dreame_mower.const import HOLD_MODELS
 
-    is_hold = any(test_device["model"].startswith(prefix) for prefix in HOLD_MODELS)
+    is_hold = test_device["model"].startswith(HOLD_MODELS)
 
     if is_hold:
         print(f"[+] Device '{test_device['model']}' correctly identified as HOLD device")
@@ -71,15 +66,21 @@ def test_platform_selection():
     """Test if correct platform would be selected."""
     print("\n[*] Testing platform selection...")
 
-    from custom_components.dreame_mower.const import DeviceType
-    from custom_components.dreame_mower import __init__
+    from homeassistant.const import Platform
+
+    from _devutil import register_packages
+
+    # Load the platform tables without the package __init__ (coordinator and cloud stack)
+    register_packages()
+    from dreame_mower._platforms import PLATFORMS_BY_DEVICE_TYPE
+    from dreame_mower.const import DeviceType
 
     device_type = DeviceType.HOLD
-    platforms = __init__.PLATFORMS_BY_DEVICE_TYPE.get(device_type)
+    platforms = PLATFORMS_BY_DEVICE_TYPE.get(device_type)
 
     if platforms:
         print(f"[+] Platforms for HOLD device: {platforms}")
-        print(f"[+] vacuum platform included: {__init__.Platform.VACUUM in platforms}")
+        print(f"[+] vacuum platform included: {Platform.VACUUM in platforms}")
     else:
         print(f"[!] No platforms found for HOLD device")
         return False
@@ -138,4 +139,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Add project root to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
     raise SystemExit(main())
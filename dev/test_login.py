@@ -2,24 +2,17 @@
 """Test Dreame cloud login using DreameMowerCloudBase."""
 
 import sys
-import importlib.util
 from pathlib import Path
 
+from _devutil import register_packages
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+register_packages()
 
-def load_cloud_base():
-    """Load DreameMowerCloudBase class."""
-    spec = importlib.util.spec_from_file_location(
-        "cloud_base",
-        project_root / "custom_components" / "dreame_mower" / "dreame" / "cloud" / "cloud_base.py"
-    )
-    cloud_base = importlib.util.module_from_spec(spec)
-    sys.modules["cloud_base"] = cloud_base
-    spec.loader.exec_module(cloud_base)
-    return cloud_base
+from dreame_mower.dreame.cloud.cloud_base import DreameMowerCloudBase  # noqa: E402
 
 
 def main():
@@ -37,10 +30,8 @@ def main():
     print(f"    Account Type: {args.account_type}")
     print()
 
-    cloud_base = load_cloud_base()
-
     # Create cloud client
-    cloud = cloud_base.DreameMowerCloudBase(
+    cloud = DreameMowerCloudBase(
         username=args.username,
         password=args.password,
         country=args.country,
@@ -89,7 +80,3 @@ def main():
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
-
-if __name__ == "__main__":
-    raise SystemExit(main())
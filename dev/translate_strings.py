@@ -10,6 +10,8 @@ Key features:
 - Removes obsolete keys that no longer exist in the English master
 - Only translates missing keys (preserves existing translations)
 - Force mode to retranslate all keys
+- Caches translations across runs in dev/.translate_cache.json
+- Skips languages already generated from the current en.json (hashes in dev/.translate_state.json)
 - Quiet by default with optional verbose output
 
 Requirements:
@@ -38,11 +40,14 @@ Languages supported:
 """
 
 import argparse
+import hashlib
 import json
+import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
+import random
 
 try:
     from googletrans import Translator  # type: ignore[import-not-found]
@@ -74,12 +79,49 @@ TRANSLATE_LANG_MAP = {
     'pt-BR': 'pt',  # Google Translate uses 'pt' for Portuguese
 }
 
+# Maximum number of strings sent in a single translate request
+BATCH_SIZE = 50
+
+# Maximum number of translate requests in flight across all languages
+MAX_CONCURRENT_REQUESTS = 4
+
+# Translations persisted across runs, keyed by "<google_lang>:<english text>"
+CACHE_FILE = Path(__file__).parent / '.translate_cache.json'
+
+# SHA-1 of the en.json each language file was last generated from, keyed by language code
+SOURCE_STATE_FILE = Path(__file__).parent / '.translate_state.json'
+
+# Exponential backoff (seconds) between retries when the server gives no Retry-After;
+# BACKOFF_MAX also caps the server's Retry-After
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+
+def retry_delay(error: Exception, attempt: int) -> Tuple[float, bool]:
+    """Return (seconds to wait, rate limited) for a failed translate request."""
+    response = getattr(error, 'response', None)
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX), True
+        rate_limited = response.status_code == 429
+    else:
+        rate_limited = False
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) + random.uniform(0, 0.5), rate_limited
+
+
 class TranslationManager:
     def __init__(self, dry_run: bool = False, force: bool = False, verbose: bool = False):
         self.dry_run = dry_run
         self.force = force
         self.verbose = verbose
-        self.translator = Translator()
+        # The translator keeps one HTTP/2 client, shared by every language task
+        self.translator = Translator(http2=True)
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._rate_limit_waits = 0
+        self._rate_limit_seconds = 0.0
+        self._cache = self.load_state(CACHE_FILE)
+        self._source_shas = self.load_state(SOURCE_STATE_FILE)
         self.translations_dir = Path(__file__).parent.parent / 'custom_components' / 'dreame_mower' / 'translations'
         self.english_file = self.translations_dir / 'en.json'
         
@@ -101,116 +143,176 @@ class TranslationManager:
             print(f"🔍 [DRY RUN] Would save to: {file_path}")
             return
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Encode in one go and write with a single call
+        file_path.write_bytes(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
         print(f"✅ Saved: {file_path}")
     
-    async def translate_text(self, text: str, target_lang: str) -> str:
-        """Translate text using Google Translate asynchronously."""
-        if not text or text.strip() == "":
-            return text
-        
-        # Map language codes for Google Translate
-        google_lang = TRANSLATE_LANG_MAP.get(target_lang, target_lang)
-        
+    async def aclose(self) -> None:
+        """Close the translator's HTTP client."""
+        await self.translator.client.aclose()
+    
+    @staticmethod
+    def load_state(file_path: Path) -> Dict[str, str]:
+        """Load a state file (cache or source hashes), starting empty if it is missing or unreadable."""
+        try:
+            return json.loads(file_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+    
+    def save_state(self) -> None:
+        """Atomically write the translation cache and source hashes."""
+        if self.dry_run:
+            return
+        for data, file_path in ((self._cache, CACHE_FILE), (self._source_shas, SOURCE_STATE_FILE)):
+            if not data:
+                continue
+            tmp_file = file_path.with_suffix('.tmp')
+            tmp_file.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_file, file_path)
+    
+    async def translate_chunk(self, texts: List[str], google_lang: str) -> Optional[List[str]]:
+        """Translate a list of strings in one Google Translate request; None if every attempt failed."""
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                # Add small delay to avoid rate limiting
-                if attempt > 0:
-                    await asyncio.sleep(1)
-                
-                result = await self.translator.translate(text, src='en', dest=google_lang)
-                if result and hasattr(result, 'text') and result.text:
-                    return result.text
-                else:
-                    print(f"⚠️  Warning: Empty translation result for '{text}' -> {target_lang}")
-                    return text
+                async with self._sem:
+                    results = await self.translator.translate(texts, src='en', dest=google_lang)
+                translated = []
+                for text, result in zip(texts, results):
+                    if result and hasattr(result, 'text') and result.text:
+                        translated.append(result.text)
+                    else:
+                        print(f"⚠️  Warning: Empty translation result for '{text}' -> {google_lang}")
+                        translated.append(text)
+                return translated
                     
             except Exception as e:
-                print(f"⚠️  Translation attempt {attempt + 1} failed for '{text}' -> {target_lang}: {e}")
+                print(f"⚠️  Translation attempt {attempt + 1} failed for {len(texts)} strings -> {google_lang}: {e}")
                 if attempt == max_retries - 1:
-                    print(f"❌ Failed to translate '{text}' after {max_retries} attempts, keeping original")
-                    return text
-                await asyncio.sleep(2)  # Wait longer between retries
+                    print(f"❌ Failed to translate {len(texts)} strings after {max_retries} attempts, keeping originals")
+                    return None
+                delay, rate_limited = retry_delay(e, attempt)
+                if rate_limited:
+                    self._rate_limit_waits += 1
+                    self._rate_limit_seconds += delay
+                await asyncio.sleep(delay)
+        
+        return None
+    
+    async def translate_texts(self, texts: List[str], google_lang: str) -> List[str]:
+        """Translate strings via the cache, then in batches of BATCH_SIZE; results keep input order."""
+        translated = list(texts)
         
-        return text
+        # Unique uncached strings, each mapped to the positions it fills; blank strings are kept as-is
+        missing: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            cached = None if self.force else self._cache.get(f"{google_lang}:{text}")
+            if cached is not None:
+                translated[i] = cached
+            else:
+                missing.setdefault(text, []).append(i)
+        
+        async def run_batch(batch: List[str]) -> Tuple[List[str], Optional[List[str]]]:
+            return batch, await self.translate_chunk(batch, google_lang)
+        
+        # Chunks run concurrently (bounded by the shared semaphore); handle each as it finishes
+        unique = list(missing)
+        batches = [unique[start:start + BATCH_SIZE] for start in range(0, len(unique), BATCH_SIZE)]
+        for done, future in enumerate(asyncio.as_completed([run_batch(batch) for batch in batches]), 1):
+            batch, results = await future
+            if len(batches) > 1:
+                print(f"⏳ {google_lang}: {done}/{len(batches)} chunks done")
+            if results is None:
+                continue
+            for text, result in zip(batch, results):
+                # Empty or untranslated results fall back to the English text; don't cache those
+                if result.strip() and result != text:
+                    self._cache[f"{google_lang}:{text}"] = result
+                for i in missing[text]:
+                    translated[i] = result
+        return translated
     
-    async def translate_dict_recursive(self, data: Dict[str, Any], target_lang: str, existing_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Recursively translate dictionary values asynchronously."""
-        if existing_data is None:
-            existing_data = {}
+    def _merge_existing(self, data: Dict[str, Any], existing_data: Dict[str, Any], pending: List[Tuple[Dict[str, Any], str, str]], removed: List[str], path: str = "") -> Dict[str, Any]:
+        """Copy data's structure, keeping existing translations and queueing (dict, key, text) for the rest.
         
+        Paths of existing keys that are gone from data are appended to removed.
+        """
         result: Dict[str, Any] = {}
+        existing_get = existing_data.get
         
         for key, value in data.items():
             if isinstance(value, dict):
-                # Recursive translation for nested dictionaries
-                existing_nested = existing_data.get(key, {}) if isinstance(existing_data.get(key), dict) else {}
-                result[key] = await self.translate_dict_recursive(value, target_lang, existing_nested)
+                # Recurse into nested dictionaries
+                existing_nested = existing_get(key)
+                if not isinstance(existing_nested, dict):
+                    existing_nested = {}
+                nested_path = f"{path}.{key}" if path else key
+                result[key] = self._merge_existing(value, existing_nested, pending, removed, nested_path)
             elif isinstance(value, str):
                 # Check if translation already exists and force flag
-                if not self.force and key in existing_data and isinstance(existing_data[key], str) and existing_data[key].strip():
-                    result[key] = existing_data[key]  # Keep existing translation
+                existing = existing_get(key)
+                if not self.force and isinstance(existing, str) and existing.strip():
+                    result[key] = existing  # Keep existing translation
                     if self.verbose:
-                        print(f"📋 Keeping existing: {key} = '{existing_data[key]}'")
+                        print(f"📋 Keeping existing: {key} = '{existing}'")
                 else:
-                    # Translate the string
-                    translated = await self.translate_text(value, target_lang)
-                    result[key] = translated
-                    print(f"🔄 Translated ({target_lang}): {key} = '{value}' -> '{translated}'")
+                    # English placeholder until the batched translation fills it in
+                    result[key] = value
+                    pending.append((result, key, value))
             else:
                 # Non-string values (arrays, numbers, etc.) - copy as is
                 result[key] = value
         
-        return result
-
-    def _find_removed_keys(self, english_data: Dict[str, Any], existing_data: Dict[str, Any], path: str = "") -> List[str]:
-        """Find keys that exist in existing_data but not in english_data."""
-        removed_keys = []
-        
+        # Keys no longer in data, or whose nested dict was replaced with a non-dict
         for key, value in existing_data.items():
-            current_path = f"{path}.{key}" if path else key
-            
-            if key not in english_data:
-                # Key was completely removed
-                removed_keys.append(current_path)
-            elif isinstance(value, dict) and isinstance(english_data.get(key), dict):
-                # Recursively check nested dictionaries
-                removed_keys.extend(
-                    self._find_removed_keys(english_data[key], value, current_path)
-                )
-            elif isinstance(value, dict) and not isinstance(english_data.get(key), dict):
-                # Structure changed - nested dict was replaced with non-dict
-                removed_keys.append(current_path)
-                
-        return removed_keys
+            if key not in data or (isinstance(value, dict) and not isinstance(data[key], dict)):
+                removed.append(f"{path}.{key}" if path else key)
+        
+        return result
     
-    async def translate_language(self, lang_code: str) -> None:
+    async def translate_dict_recursive(self, data: Dict[str, Any], target_lang: str, existing_data: Optional[Dict[str, Any]] = None, removed: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Translate dictionary values, sending all missing strings in batched requests.
+        
+        Obsolete keys found in existing_data are collected into removed, if given.
+        """
+        pending: List[Tuple[Dict[str, Any], str, str]] = []
+        result = self._merge_existing(data, existing_data or {}, pending, [] if removed is None else removed)
+        
+        if pending:
+            # Map language codes for Google Translate (once per language)
+            google_lang = TRANSLATE_LANG_MAP.get(target_lang, target_lang)
+            translations = await self.translate_texts([text for _, _, text in pending], google_lang)
+            for (target, key, value), translated in zip(pending, translations):
+                target[key] = translated
+                print(f"🔄 Translated ({target_lang}): {key} = '{value}' -> '{translated}'")
+        
+        return result
+
+    async def translate_language(self, lang_code: str, english_data: Dict[str, Any], source_sha: str) -> None:
         """Translate to a specific language asynchronously."""
-        print(f"\n🌍 Translating to {LANGUAGES[lang_code]} ({lang_code})...")
+        target_file = self.translations_dir / f'{lang_code}.json'
         
-        # Load English master
-        english_data = self.load_json(self.english_file)
-        if not english_data:
-            print(f"❌ Could not load English master file")
+        # Nothing to do if this file was generated from the current en.json
+        if not self.force and self._source_shas.get(lang_code) == source_sha and target_file.exists():
+            print(f"✅ {LANGUAGES[lang_code]} is up to date")
             return
         
+        print(f"\n🌍 Translating to {LANGUAGES[lang_code]} ({lang_code})...")
+        
         # Load existing translation if it exists
-        target_file = self.translations_dir / f'{lang_code}.json'
         existing_data = self.load_json(target_file) if target_file.exists() else {}
         
-        # Find and report removed keys
-        if existing_data:
-            removed_keys = self._find_removed_keys(english_data, existing_data)
-            if removed_keys:
-                print(f"🗑️  Removing {len(removed_keys)} obsolete keys: {', '.join(removed_keys)}")
-        
         # Translate (this will only include keys present in english_data)
-        translated_data = await self.translate_dict_recursive(english_data, lang_code, existing_data)
+        removed_keys: List[str] = []
+        translated_data = await self.translate_dict_recursive(english_data, lang_code, existing_data, removed_keys)
+        if removed_keys:
+            print(f"🗑️  Removing {len(removed_keys)} obsolete keys: {', '.join(removed_keys)}")
         
         # Save result
         self.save_json(translated_data, target_file)
+        self._source_shas[lang_code] = source_sha
         print(f"✅ Completed translation for {LANGUAGES[lang_code]}")
     
     async def translate_all(self, languages: Optional[List[str]] = None) -> None:
@@ -223,18 +325,32 @@ class TranslationManager:
         if self.force:
             print("🔄 FORCE MODE - All strings will be retranslated")
         
+        known_languages = []
         for lang_code in target_languages:
             if lang_code not in LANGUAGES:
                 print(f"⚠️  Warning: Unknown language code '{lang_code}', skipping")
                 continue
-            
-            try:
-                await self.translate_language(lang_code)
-            except Exception as e:
-                print(f"❌ Error translating to {lang_code}: {e}")
-                continue
+            known_languages.append(lang_code)
+        
+        # Load English master once for all languages
+        english_data = self.load_json(self.english_file)
+        if not english_data:
+            print(f"❌ Could not load English master file")
+            return
+        source_sha = hashlib.sha1(self.english_file.read_bytes()).hexdigest()
+        
+        # Languages are independent, so translate them concurrently
+        results = await asyncio.gather(
+            *(self.translate_language(lang_code, english_data, source_sha) for lang_code in known_languages),
+            return_exceptions=True,
+        )
+        for lang_code, result in zip(known_languages, results):
+            if isinstance(result, Exception):
+                print(f"❌ Error translating to {lang_code}: {result}")
         
         print(f"\n🎉 Translation completed for {len(target_languages)} languages!")
+        if self._rate_limit_waits:
+            print(f"⏳ Rate limited {self._rate_limit_waits} times, waited {self._rate_limit_seconds:.0f}s in total")
 
 
 async def main():
@@ -283,7 +399,11 @@ async def main():
     
     try:
         manager = TranslationManager(dry_run=args.dry_run, force=args.force, verbose=args.verbose)
-        await manager.translate_all(args.languages)
+        try:
+            await manager.translate_all(args.languages)
+        finally:
+            manager.save_state()
+            await manager.aclose()
     except KeyboardInterrupt:
         print("\n⏹️  Translation interrupted by user")
     except Exception as e:
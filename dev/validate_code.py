@@ -1,27 +1,43 @@
 #!/usr/bin/env python3
 """Simple code validation for hold device support."""
 
-import sys
+import mmap
+import os
+import re
 from pathlib import Path
 
-def check_const_py():
-    """Check const.py has necessary definitions."""
-    print("[*] Checking const.py...")
 
-    const_file = Path("custom_components/dreame_mower/const.py")
-    with open(const_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+def scan(path, patterns):
+    """Return {pattern: found} for byte patterns, scanning the mmapped file once."""
+    found = dict.fromkeys(patterns, False)
+    # Longest first inside a lookahead so prefix and overlapping patterns are all seen
+    alternation = b"|".join(re.escape(p) for p in sorted(patterns, key=len, reverse=True))
+    regex = re.compile(b"(?=(" + alternation + b"))")
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return found
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            remaining = len(found)
+            for match in regex.finditer(mm):
+                hit = match.group(1)
+                for pattern, seen in found.items():
+                    if not seen and hit.startswith(pattern):
+                        found[pattern] = True
+                        remaining -= 1
+                if not remaining:
+                    break
+
+    return found
 
-    checks = [
-        ("DeviceType class", "class DeviceType:" in content),
-        ("DeviceType.HOLD", 'HOLD = "hold"' in content),
-        ("HOLD_MODELS", "HOLD_MODELS" in content),
-        ("dreame.hold", '"dreame.hold."' in content),
-        ("CONF_DEVICE_TYPE", "CONF_DEVICE_TYPE" in content),
-    ]
+
+def run_checks(path, checks):
+    """Print a pass/fail line per (name, pattern) check; True if all passed."""
+    found = scan(path, [pattern for _, pattern in checks])
 
     all_pass = True
-    for name, passed in checks:
+    for name, pattern in checks:
+        passed = found[pattern]
         status = "[+]" if passed else "[!]"
         print(f"  {status} {name}")
         if not passed:
@@ -30,30 +46,30 @@ def check_const_py():
     return all_pass
 
 
-def check_config_flow_py():
-    """Check config_flow.py imports HOLD_MODELS."""
-    print("\n[*] Checking config_flow.py...")
+def check_const_py():
+    """Check const.py has necessary definitions."""
+    print("[*] Checking const.py...")
 
-    const_file = Path("custom_components/dreame_mower/config_flow.py")
-    with open(const_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    return run_checks(Path("custom_components/dreame_mower/const.py"), [
+        ("DeviceType class", b"class DeviceType:"),
+        ("DeviceType.HOLD", b'HOLD = "hold"'),
+        ("HOLD_MODELS", b"HOLD_MODELS"),
+        ("dreame.hold", b'"dreame.hold."'),
+        ("CONF_DEVICE_TYPE", b"CONF_DEVICE_TYPE"),
+    ])
 
-    checks = [
-        ("Import HOLD_MODELS", "HOLD_MODELS" in content),
-        ("Import DeviceType", "DeviceType" in content),
-        ("dreame.hold in model_map", '"dreame.hold.w2422"' in content),
-        ("device_type in _extract_info", "self.device_type" in content),
-        ("CONF_DEVICE_TYPE in data", "CONF_DEVICE_TYPE" in content),
-    ]
 
-    all_pass = True
-    for name, passed in checks:
-        status = "[+]" if passed else "[!]"
-        print(f"  {status} {name}")
-        if not passed:
-            all_pass = False
+def check_config_flow_py():
+    """Check config_flow.py imports HOLD_MODELS."""
+    print("\n[*] Checking config_flow.py...")
 
-    return all_pass
+    return run_checks(Path("custom_components/dreame_mower/config_flow.py"), [
+        ("Import HOLD_MODELS", b"HOLD_MODELS"),
+        ("Import DeviceType", b"DeviceType"),
+        ("dreame.hold in model_map", b'"dreame.hold.w2422"'),
+        ("device_type in _extract_info", b"self.device_type"),
+        ("CONF_DEVICE_TYPE in data", b"CONF_DEVICE_TYPE"),
+    ])
 
 
 def check_hold_py():
@@ -65,53 +81,37 @@ def check_hold_py():
         print(f"  [!] hold.py does not exist")
         return False
 
-    with open(hold_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    checks = [
-        ("File exists", True),
-        ("StateVacuumEntity imported", "StateVacuumEntity" in content),
-        ("DreameHoldEntity class", "class DreameHoldEntity" in content),
-        ("async_setup_entry", "async_setup_entry" in content),
-        ("battery_level property", "battery_level" in content),
-        ("async_start method", "async_start" in content),
-        ("async_pause method", "async_pause" in content),
-    ]
-
-    all_pass = True
-    for name, passed in checks:
-        status = "[+]" if passed else "[!]"
-        print(f"  {status} {name}")
-        if not passed:
-            all_pass = False
-
-    return all_pass
+    print("  [+] File exists")
+    return run_checks(hold_file, [
+        ("StateVacuumEntity imported", b"StateVacuumEntity"),
+        ("DreameHoldEntity class", b"class DreameHoldEntity"),
+        ("async_setup_entry", b"async_setup_entry"),
+        ("battery_level property", b"battery_level"),
+        ("async_start method", b"async_start"),
+        ("async_pause method", b"async_pause"),
+    ])
 
 
 def check_init_py():
     """Check __init__.py has platform selection logic."""
     print("\n[*] Checking __init__.py...")
 
-    init_file = Path("custom_components/dreame_mower/__init__.py")
-    with open(init_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    return run_checks(Path("custom_components/dreame_mower/__init__.py"), [
+        ("Import DeviceType", b"DeviceType"),
+        ("PLATFORMS_BY_DEVICE_TYPE", b"PLATFORMS_BY_DEVICE_TYPE"),
+        ("device_type from entry", b'entry.data.get("device_type"'),
+    ])
 
-    checks = [
-        ("Import DeviceType", "DeviceType" in content),
-        ("PLATFORMS_BY_DEVICE_TYPE", "PLATFORMS_BY_DEVICE_TYPE" in content),
-        ("DeviceType.HOLD mapping", 'DeviceType.HOLD' in content),
-        ("Platform.VACUUM for HOLD", "Platform.VACUUM" in content),
-        ("device_type from entry", "entry.data.get(\"device_type\"" in content),
-    ]
 
-    all_pass = True
-    for name, passed in checks:
-        status = "[+]" if passed else "[!]"
-        print(f"  {status} {name}")
-        if not passed:
-            all_pass = False
+def check_platforms_py():
+    """Check _platforms.py maps hold devices to the vacuum platform."""
+    print("\n[*] Checking _platforms.py...")
 
-    return all_pass
+    return run_checks(Path("custom_components/dreame_mower/_platforms.py"), [
+        ("PLATFORMS_BY_DEVICE_TYPE", b"PLATFORMS_BY_DEVICE_TYPE"),
+        ("DeviceType.HOLD mapping", b"DeviceType.HOLD"),
+        ("Platform.VACUUM for HOLD", b"Platform.VACUUM"),
+    ])
 
 
 def main():
@@ -120,19 +120,24 @@ def main():
     print("="*60)
     print()
 
-    tests = [
-        check_const_py(),
-        check_config_flow_py(),
+    checks = (
+        check_const_py,
+        check_config_flow_py,
         check_hold_py,
         check_init_py,
-    ]
+        check_platforms_py,
+    )
+
+    # Run every check so all failures are reported, not just the first
+    results = [check() for check in checks]
+    passed = all(results)
 
     print()
     print("="*60)
     print("Validation Summary:")
     print("="*60)
 
-    if all(tests):
+    if passed:
         print("\n[+] All checks passed!")
         print()
         print("Your code modifications look correct.")
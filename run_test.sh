@@ -3,7 +3,7 @@
 # Test runner script for dreame-mower project
 # 
 # This script runs comprehensive tests on the codebase:
-# 1. pytest - Runs all unit tests (tests/ directory)
+# 1. pytest - Runs all unit tests (tests/ directory) in parallel via pytest-xdist
 # 2. mypy (main) - Type checks main codebase (custom_components/)
 # 3. mypy (dev) - Type checks development scripts (dev/)
 #
@@ -65,7 +65,7 @@ fi
 
 # 1. Run pytest
 print_header "Running pytest"
-if .venv/bin/pytest --tb=short; then
+if .venv/bin/pytest -n auto --tb=short; then
     # Get test count from last run (approximate)
     PYTEST_RESULT=0
     print_success "pytest"
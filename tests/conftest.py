@@ -12,9 +12,9 @@ def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
     pass
 
 
-@pytest.fixture(name="skip_notifications", autouse=True)
+@pytest.fixture(name="skip_notifications", autouse=True, scope="session")
 def skip_notifications_fixture():
-    """Skip notification calls."""
+    """Skip notification calls (patched once for the whole session)."""
     with patch("homeassistant.components.persistent_notification.async_create"), patch(
         "homeassistant.components.persistent_notification.async_dismiss"
     ):
@@ -1,15 +1,82 @@
 """Tests for the Dreame Mower protocol module."""
 
-import json
-from unittest.mock import Mock, patch, PropertyMock
+import re
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 import pytest
 import requests
 
+# cloud_device imports paho at module load; skip the whole module when it is missing
+pytest.importorskip("paho.mqtt.client")
+
+from custom_components.dreame_mower.dreame.cloud.cloud_base import (
+    DREAME_STRINGS,
+    _decode_api_strings,
+)
 from custom_components.dreame_mower.dreame.cloud.cloud_device import (
     DreameMowerCloudDevice,
 )
 # Use standard ConnectionError for cloud/device communication issues
 
+_TEST_ERROR_RE = re.compile("Test error")
+_EMPTY_JSON_OBJ = "{}"
+
+# Decoded dreame API string table, bound once at import
+_API = tuple(_decode_api_strings(DREAME_STRINGS))
+
+# Name-mangled private connection flags, written straight into the cloud base instance dict
+_HTTP = "_DreameMowerCloudBase__http_api_connected"
+_LOGGED = "_DreameMowerCloudBase__logged_in"
+
+
+class _RecordingSend:
+    """Minimal callable stand-in that records its calls and returns or raises a fixed outcome."""
+
+    def __init__(self, return_value=None, side_effect=None):
+        self.return_value = return_value
+        self.side_effect = side_effect
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.return_value
+
+
+def _setup_api_call_mock(protocol, return_value):
+    """Install a Mock _api_call on the protocol's cloud base and return it."""
+    protocol._cloud_base._api_call = Mock(return_value=return_value)
+    return protocol._cloud_base._api_call
+
+
+def _set_base_connected(protocol, connected):
+    """Drive DreameMowerCloudBase.connected through its backing flags."""
+    protocol._cloud_base.__dict__[_LOGGED] = connected
+    protocol._cloud_base.__dict__[_HTTP] = connected
+
+
+def _setup_protocol_for_send_tests(protocol, host, device_id):
+    """Set the host, device id and request id that send() reads."""
+    protocol._host = host
+    protocol._device_id = device_id
+    protocol._cloud_base._id = 1
+    return protocol
+
+
+@pytest.fixture(scope="module")
+def _mqtt_client_patch():
+    """Patch the paho Client class once for the whole module."""
+    with patch('custom_components.dreame_mower.dreame.cloud.cloud_device.mqtt_client.Client') as client_cls:
+        yield client_cls
+
+
+@pytest.fixture
+def mqtt_client_cls(_mqtt_client_patch):
+    """Module-wide patched Client class, reset for each test."""
+    _mqtt_client_patch.reset_mock(return_value=True, side_effect=True)
+    return _mqtt_client_patch
+
 
 class TestDreameMowerCloudDevice:
     """Test DreameMowerCloudDevice class."""
@@ -35,24 +102,34 @@ class TestDreameMowerCloudDevice:
             device_id=self.TEST_DID
         )
 
-    def setup_api_call_mock(self, protocol, return_value):
-        """Helper method to setup _api_call mock."""
-        protocol._cloud_base._api_call = Mock(return_value=return_value)
-        return protocol._cloud_base._api_call
-
-    def setup_successful_response_mock(self, status_code=200, response_data=None):
-        """Helper method to create a successful response mock."""
-        mock_response = Mock()
-        mock_response.status_code = status_code
-        mock_response.text = json.dumps(response_data) if response_data else '{"code": 0}'
-        mock_response.content = json.dumps(response_data).encode() if response_data else b'{"code": 0}'
-        return mock_response
-
-    def setup_protocol_for_send_tests(self, protocol):
-        """Helper method to setup protocol for send-related tests."""
-        protocol._host = self.TEST_HOST
-        protocol._device_id = self.TEST_DID
-        protocol._cloud_base._id = 1
+    @pytest.fixture
+    def base_connected(self, protocol):
+        """Mark the protocol's cloud base as logged in with the HTTP API connected."""
+        _set_base_connected(protocol, True)
+
+    @pytest.fixture
+    def device_id_patched(self, protocol):
+        """Give the protocol device id "123" for the payload-building tests."""
+        protocol._device_id = "123"
+
+    @pytest.fixture
+    def mqtt_mock_client(self, protocol):
+        """Mock MQTT client already attached to the protocol."""
+        client = Mock()
+        protocol._mqtt_client = client
+        return client
+
+    @pytest.fixture
+    def mock_timer(self):
+        """Patch the reconnect Timer class used by cloud_device."""
+        with patch('custom_components.dreame_mower.dreame.cloud.cloud_device.Timer') as timer_cls:
+            yield timer_cls
+
+    @pytest.fixture
+    def send_protocol(self, request, protocol):
+        """Protocol prepared for send(); request.param is the _api_call response."""
+        _setup_protocol_for_send_tests(protocol, self.TEST_HOST, self.TEST_DID)
+        _setup_api_call_mock(protocol, request.param)
         return protocol
 
 
@@ -83,21 +160,19 @@ class TestDreameMowerCloudDevice:
         1. The cloud base HTTP API is connected (connected is True)
         2. The MQTT client is connected (_mqtt_client_connected is True)
         """
-        # Mock the base connected property
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock) as mock_base_connected:
-            # HTTP not connected - should be False regardless of MQTT state
-            mock_base_connected.return_value = False
-            protocol._mqtt_client_connected = True
-            assert protocol.connected is False
+        # HTTP not connected - should be False regardless of MQTT state
+        _set_base_connected(protocol, False)
+        protocol._mqtt_client_connected = True
+        assert protocol.connected is False
             
-            # HTTP connected but MQTT not connected - should be False  
-            mock_base_connected.return_value = True
-            protocol._mqtt_client_connected = False
-            assert protocol.connected is False
+        # HTTP connected but MQTT not connected - should be False  
+        _set_base_connected(protocol, True)
+        protocol._mqtt_client_connected = False
+        assert protocol.connected is False
             
-            # Both HTTP and MQTT connected - should be True
-            protocol._mqtt_client_connected = True
-            assert protocol.connected is True
+        # Both HTTP and MQTT connected - should be True
+        protocol._mqtt_client_connected = True
+        assert protocol.connected is True
 
     def test_object_name_property(self, protocol):
         """Test object_name property."""
@@ -121,20 +196,18 @@ class TestDreameMowerCloudDevice:
         assert len(agent_id) == 13
         assert all(c in "ABCDEF" for c in agent_id)
 
-    def test_initialize_sets_fields_from_base_info(self, protocol):
+    def test_initialize_sets_fields_from_base_info(self, protocol, base_connected):
         """Initializer should set core fields from base device info."""
         protocol._device_id = "test_did"
-        s = protocol._cloud_base._api_strings
         info = {
-            s[8]: "test_uid",
+            _API[8]: "test_uid",
             "did": "test_did",
-            s[35]: "test_model",
-            s[9]: "test_host:8883",
-            s[10]: json.dumps({}),
+            _API[35]: "test_model",
+            _API[9]: "test_host:8883",
+            _API[10]: _EMPTY_JSON_OBJ,
         }
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            protocol._cloud_base._api_call = Mock(return_value={"code": 0, "data": info})
-            assert protocol._initialize_mqtt_connection_state() is True
+        protocol._cloud_base._api_call = Mock(return_value={"code": 0, "data": info})
+        assert protocol._initialize_mqtt_connection_state() is True
         assert protocol._uid == "test_uid"
         assert protocol._device_id == "test_did"
         assert protocol._model == "test_model"
@@ -144,153 +217,82 @@ class TestDreameMowerCloudDevice:
 
 
 
-    def test_refresh_mqtt_credentials_different(self, protocol):
+    def test_refresh_mqtt_credentials_different(self, protocol, mqtt_mock_client):
         """Test _refresh_mqtt_credentials when keys are different."""
         protocol._mqtt_client_key = "old_key"
         protocol._cloud_base._key = "new_key"
         protocol._cloud_base._uuid = "test_uuid"
-        protocol._mqtt_client = Mock()
         
         result = protocol._refresh_mqtt_credentials()
         
         assert result is True
         assert protocol._mqtt_client_key == "new_key"
-        protocol._mqtt_client.username_pw_set.assert_called_once_with("test_uuid", "new_key")
+        mqtt_mock_client.username_pw_set.assert_called_once_with("test_uuid", "new_key")
 
-    def test_refresh_mqtt_credentials_same(self, protocol):
+    def test_refresh_mqtt_credentials_same(self, protocol, mqtt_mock_client):
         """Test _refresh_mqtt_credentials when keys are same."""
         protocol._mqtt_client_key = "same_key"
         protocol._cloud_base._key = "same_key"
-        protocol._mqtt_client = Mock()
         
         result = protocol._refresh_mqtt_credentials()
         
         assert result is False
-        protocol._mqtt_client.username_pw_set.assert_not_called()
+        mqtt_mock_client.username_pw_set.assert_not_called()
 
-    def test_on_mqtt_client_connect_success(self, protocol):
+    def test_on_mqtt_client_connect_success(self, protocol, mqtt_mock_client):
         """Test _on_mqtt_client_connect static method with successful connection."""
         protocol._mqtt_client_connecting = True
         protocol._mqtt_client_connected = False
         protocol._mqtt_connected_callback = Mock()
         
-        mock_client = Mock()
-        
-        DreameMowerCloudDevice._on_mqtt_client_connect(mock_client, protocol, None, 0)
+        DreameMowerCloudDevice._on_mqtt_client_connect(mqtt_mock_client, protocol, None, 0)
         
         assert protocol._mqtt_client_connecting is False
         assert protocol._mqtt_client_connected is True
-        mock_client.subscribe.assert_called_once()
+        mqtt_mock_client.subscribe.assert_called_once()
         protocol._mqtt_connected_callback.assert_called_once()
 
-    def test_on_mqtt_client_connect_failure(self, protocol):
+    def test_on_mqtt_client_connect_failure(self, protocol, mqtt_mock_client):
         """Test _on_mqtt_client_connect static method with failed connection."""
         protocol._mqtt_client_connecting = True
         protocol._mqtt_client_connected = True
         protocol._refresh_mqtt_credentials = Mock(return_value=False)
         
-        mock_client = Mock()
-        
-        DreameMowerCloudDevice._on_mqtt_client_connect(mock_client, protocol, None, 1)
+        DreameMowerCloudDevice._on_mqtt_client_connect(mqtt_mock_client, protocol, None, 1)
         
         assert protocol._mqtt_client_connecting is False
         assert protocol._mqtt_client_connected is False
 
-    def test_on_mqtt_client_disconnect_with_reconnect(self, protocol):
+    @pytest.mark.parametrize("was_connected,with_callback,callback_side_effect,expect_called", [
+        (True, False, None, False),  # Reconnect and timer scheduling without a callback
+        (True, True, None, True),  # Disconnected callback invoked
+        (False, True, None, False),  # No callback when already disconnected
+        (True, True, Exception("Callback error"), True),  # Callback errors handled gracefully
+    ])
+    def test_on_mqtt_client_disconnect(
+        self, protocol, mqtt_mock_client, mock_timer, was_connected, with_callback, callback_side_effect, expect_called
+    ):
         """Test _on_mqtt_client_disconnect static method."""
-        protocol._mqtt_client_connected = True
+        protocol._mqtt_client_connected = was_connected
         protocol._mqtt_client_connecting = False
         protocol._refresh_mqtt_credentials = Mock(return_value=False)
         protocol._mqtt_reconnect_timer_cancel = Mock()
         protocol._mqtt_reconnect_timer = None
         
-        mock_client = Mock()
-        # Add reconnect method to mock client
-        mock_client.reconnect = Mock()
-        # Ensure protocol has reference so _on_mqtt_client_disconnect sees client
-        protocol._mqtt_client = mock_client
-        
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_device.Timer') as mock_timer:
-            mock_timer_instance = Mock()
-            mock_timer.return_value = mock_timer_instance
-
-            DreameMowerCloudDevice._on_mqtt_client_disconnect(mock_client, protocol, 1)
-
-            # New logic sets _mqtt_client_connecting True then attempts immediate reconnect
-            # After disconnect handler, we expect reconnect attempt; connecting flag True
-            assert protocol._mqtt_client_connecting is True
-            mock_client.reconnect.assert_called_once()
-            mock_timer.assert_called_once_with(10, protocol._mqtt_reconnect_timer_task)
-            mock_timer_instance.start.assert_called_once()
-
-    def test_on_mqtt_client_disconnect_callback_invoked(self, protocol):
-        """Test that disconnected callback is invoked when MQTT disconnects."""
-        protocol._mqtt_client_connected = True  # Was connected
-        protocol._mqtt_client_connecting = False
-        protocol._refresh_mqtt_credentials = Mock(return_value=False)
-        protocol._mqtt_reconnect_timer_cancel = Mock()
-        protocol._mqtt_reconnect_timer = None
-        
-        # Set up disconnected callback
-        disconnected_callback = Mock()
-        protocol._mqtt_disconnected_callback = disconnected_callback
-        
-        mock_client = Mock()
-        mock_client.reconnect = Mock()
-        protocol._mqtt_client = mock_client
+        disconnected_callback = Mock(side_effect=callback_side_effect)
+        if with_callback:
+            protocol._mqtt_disconnected_callback = disconnected_callback
         
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_device.Timer'):
-            DreameMowerCloudDevice._on_mqtt_client_disconnect(mock_client, protocol, 1)
+        # Should not raise exception, even if the callback does
+        DreameMowerCloudDevice._on_mqtt_client_disconnect(mqtt_mock_client, protocol, 1)
 
-            # Verify disconnected callback was called
-            disconnected_callback.assert_called_once()
-            assert protocol._mqtt_client_connected is False
-
-    def test_on_mqtt_client_disconnect_no_callback_when_not_connected(self, protocol):
-        """Test that disconnected callback is NOT invoked if already disconnected."""
-        protocol._mqtt_client_connected = False  # Already disconnected
-        protocol._mqtt_client_connecting = False
-        protocol._refresh_mqtt_credentials = Mock(return_value=False)
-        protocol._mqtt_reconnect_timer_cancel = Mock()
-        protocol._mqtt_reconnect_timer = None
-        
-        # Set up disconnected callback
-        disconnected_callback = Mock()
-        protocol._mqtt_disconnected_callback = disconnected_callback
-        
-        mock_client = Mock()
-        mock_client.reconnect = Mock()
-        protocol._mqtt_client = mock_client
-        
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_device.Timer'):
-            DreameMowerCloudDevice._on_mqtt_client_disconnect(mock_client, protocol, 1)
-
-            # Verify disconnected callback was NOT called (wasn't connected before)
-            disconnected_callback.assert_not_called()
-
-    def test_on_mqtt_client_disconnect_callback_error_handling(self, protocol):
-        """Test that callback errors are handled gracefully."""
-        protocol._mqtt_client_connected = True
-        protocol._mqtt_client_connecting = False
-        protocol._refresh_mqtt_credentials = Mock(return_value=False)
-        protocol._mqtt_reconnect_timer_cancel = Mock()
-        protocol._mqtt_reconnect_timer = None
-        
-        # Set up callback that raises an exception
-        disconnected_callback = Mock(side_effect=Exception("Callback error"))
-        protocol._mqtt_disconnected_callback = disconnected_callback
-        
-        mock_client = Mock()
-        mock_client.reconnect = Mock()
-        protocol._mqtt_client = mock_client
-        
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_device.Timer'):
-            # Should not raise exception, even though callback does
-            DreameMowerCloudDevice._on_mqtt_client_disconnect(mock_client, protocol, 1)
-
-            # Verify callback was attempted and disconnect processing continued
-            disconnected_callback.assert_called_once()
-            assert protocol._mqtt_client_connected is False
+        assert disconnected_callback.called is expect_called
+        assert protocol._mqtt_client_connected is False
+        # Sets _mqtt_client_connecting True, attempts immediate reconnect and schedules a retry
+        assert protocol._mqtt_client_connecting is True
+        mqtt_mock_client.reconnect.assert_called_once()
+        mock_timer.assert_called_once_with(10, protocol._mqtt_reconnect_timer_task)
+        mock_timer.return_value.start.assert_called_once()
 
     def test_on_mqtt_client_message_success(self, protocol):
         """Test _on_mqtt_client_message static method with valid message."""
@@ -325,312 +327,196 @@ class TestDreameMowerCloudDevice:
         mock_timer.cancel.assert_called_once()
         assert protocol._mqtt_reconnect_timer is None
 
-    def test_mqtt_reconnect_timer_task(self, protocol):
+    def test_mqtt_reconnect_timer_task(self, protocol, mqtt_mock_client):
         """Test _mqtt_reconnect_timer_task method."""
         protocol._mqtt_client_connecting = True
         protocol._mqtt_client_connected = False  # simulate disconnected state
         protocol._mqtt_reconnect_timer_cancel = Mock()
-        mock_client = Mock()
-        protocol._mqtt_client = mock_client
 
         protocol._mqtt_reconnect_timer_task()
 
         protocol._mqtt_reconnect_timer_cancel.assert_called_once()
-        mock_client.reconnect.assert_called_once()
-
-    def test_get_device_info_success(self, protocol):
-        """Test get_device_info (public API) with successful response."""
-        protocol._device_id = "123"
-        
-        # Mock the cloud base connected property to return True
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            # Mock get_devices response with richer data
-            device_data = {"did": "123", "name": "test", "battery": 85, "sn": "TEST123", "featureCode": -1}
-            
-            protocol._cloud_base.get_devices = Mock(return_value={
-                protocol._cloud_base._api_strings[34]: {
-                    protocol._cloud_base._api_strings[36]: [device_data]
-                }
-            })
-            
-            result = protocol.get_device_info()
-            
-            # The public API should NOT call _handle_device_info (no side effects)
-            # Should return the rich device data from get_devices()
-            assert result == device_data
+        mqtt_mock_client.reconnect.assert_called_once()
 
-    def test_initialize_mqtt_connection_state_success(self, protocol):
-        """Initializer returns True on valid base info and sets fields."""
-        protocol._device_id = "123"
-        s = protocol._cloud_base._api_strings
-        device_data = {
-            s[8]: "uid123",
-            "did": "123",
-            s[35]: "m123",
-            s[9]: "host.example:8883",
-            s[10]: "",
-        }
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            protocol._cloud_base._api_call = Mock(return_value={"code": 0, "data": device_data})
-            result = protocol._initialize_mqtt_connection_state()
-        assert result is True
-        assert protocol._uid == "uid123"
-        assert protocol._host == "host.example:8883"
+    _DEVICE_DATA = {"did": "123", "name": "test", "battery": 85, "sn": "TEST123", "featureCode": -1}
 
-    def test_get_device_info_device_not_found(self, protocol):
-        """Test get_device_info (public API) when device is not in the devices list."""
+    @pytest.mark.parametrize("connected,device_list,expected", [
+        (True, [_DEVICE_DATA], _DEVICE_DATA),  # Returns the rich device data from get_devices()
+        (True, [{"did": "456", "name": "other_device"}], None),  # Device not in the devices list
+        (False, None, None),  # Unable to connect after attempting connection
+    ])
+    def test_get_device_info(self, protocol, connected, device_list, expected):
+        """Test get_device_info (public API) against the devices list."""
         protocol._device_id = "123"
-        
-        # Mock the cloud base connected property to return True
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            # Mock get_devices to return a list without our device
+        _set_base_connected(protocol, connected)
+        protocol._cloud_base.connect = Mock(return_value=False)
+        if connected:
             protocol._cloud_base.get_devices = Mock(return_value={
-                protocol._cloud_base._api_strings[34]: {
-                    protocol._cloud_base._api_strings[36]: [{"did": "456", "name": "other_device"}]
+                _API[34]: {
+                    _API[36]: device_list
                 }
             })
-            
-            result = protocol.get_device_info()
-            
-            assert result is None
 
-    def test_initialize_mqtt_connection_state_no_data(self, protocol):
-        """Returns False when base info is empty dict."""
-        protocol._device_id = "123"
-        
-        # Mock the cloud base connected property to return True
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            protocol._cloud_base._api_call = Mock(return_value={"code": 0, "data": {}})  # missing required fields
-            result = protocol._initialize_mqtt_connection_state()
-            assert result is False
+        # The public API should NOT call _handle_device_info (no side effects)
+        assert protocol.get_device_info() == expected
 
-    def test_initialize_mqtt_connection_state_incomplete_data_keyerror(self, protocol):
-        """Non-empty but incomplete base info should yield False without setting fields."""
+    @pytest.mark.parametrize("connected,base_info,expected_result,expected_uid,expected_host", [
+        (True, {_API[8]: "uid123", "did": "123", _API[35]: "m123", _API[9]: "host.example:8883", _API[10]: ""},
+         True, "uid123", "host.example:8883"),  # Valid base info sets fields
+        (True, {}, False, None, None),  # Empty base info
+        (True, {"did": "123", _API[35]: "m"}, False, None, None),  # Missing uid, host, property (KeyError)
+        (False, None, False, None, None),  # Unable to connect after attempting connection
+    ])
+    def test_initialize_mqtt_connection_state(
+        self, protocol,
+        connected, base_info, expected_result, expected_uid, expected_host
+    ):
+        """Test _initialize_mqtt_connection_state result and the fields it sets."""
         protocol._device_id = "123"
+        _set_base_connected(protocol, connected)
+        protocol._cloud_base.connect = Mock(return_value=False)
+        if base_info is not None:
+            _setup_api_call_mock(protocol, {"code": 0, "data": base_info})
 
-        # Mock the cloud base connected property to return True
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            s = protocol._cloud_base._api_strings
-            incomplete = {"did": "123", s[35]: "m"}  # missing uid, host, property
-            protocol._cloud_base._api_call = Mock(return_value={"code": 0, "data": incomplete})
-            result = protocol._initialize_mqtt_connection_state()
-            assert result is False
-            assert protocol._uid is None
-
-    def test_get_device_info_not_logged_in(self, protocol):
-        """Test get_device_info (public API) returns None when unable to connect after attempting connection."""
-        protocol._device_id = "123"
-        
-        # Mock the cloud base connected property to return False (simulating connection failure)
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=False):
-            result = protocol.get_device_info()
-            assert result is None
-
-    def test_initialize_mqtt_connection_state_not_logged_in(self, protocol):
-        """Test _initialize_mqtt_connection_state returns False when unable to connect after attempting connection."""
-        protocol._device_id = "123"
-        
-        # Mock the cloud base connected property to return False (simulating connection failure)
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=False):
-            assert protocol._initialize_mqtt_connection_state() is False
+        assert protocol._initialize_mqtt_connection_state() is expected_result
+        assert protocol._uid == expected_uid
+        assert protocol._host == expected_host
 
     # send_async removed in current implementation; covered in legacy tests
 
-    def test_send_success(self, protocol):
-        """Test send method with successful response."""
-        self.setup_protocol_for_send_tests(protocol)
+    @pytest.mark.parametrize("send_protocol,expected", [
+        ({"code": 0, "data": {"result": "success"}}, "success"),
+        ({"code": 0}, None),  # Successful response (code=0) but no data field
+        ({"code": 0, "data": {}}, None),  # Successful response with data but no result field
+    ], indirect=["send_protocol"])
+    def test_send_returns(self, send_protocol, expected):
+        """Test send method with successful responses.
         
+        Verifies that send returns the result, or None for successful but empty
+        responses, and marks the device reachable.
+        """
         # Start with unreachable
-        protocol._device_reachable = False
-        
-        self.setup_api_call_mock(protocol, {
-            "code": 0,
-            "data": {"result": "success"}
-        })
-        
-        result = protocol.send("test_method", {"param": "value"})
-        
-        assert result == "success"
-        assert protocol._cloud_base._id == 2
-        assert protocol.device_reachable is True
-
-    def test_send_timeout_error_80001(self, protocol):
-        """Test send method with timeout error code 80001.
-        
-        Verifies that send method throws TimeoutError for device offline scenarios
-        and updates device_reachable state.
+        send_protocol._device_reachable = False
+        
+        result = send_protocol.send("test_method", {"param": "value"})
+        
+        assert result == expected
+        assert send_protocol._cloud_base._id == 2
+        assert send_protocol.device_reachable is True
+
+    @pytest.mark.parametrize("send_protocol,exc,match,reachable", [
+        # Device offline/timeout updates device_reachable state
+        ({"code": 80001, "msg": "Device offline"}, TimeoutError, re.compile("Device offline"), False),
+        ({"code": 500, "msg": "server error"}, RuntimeError, re.compile("Cloud API error 500: server error"), True),  # Generic server error
+        ({"code": 403, "msg": "forbidden"}, RuntimeError, re.compile("Cloud API error 403: forbidden"), True),  # Forbidden error
+        ({"code": 404, "msg": "not found"}, RuntimeError, re.compile("Cloud API error 404: not found"), True),  # Not found error
+        ({"code": 1001, "msg": "custom error"}, RuntimeError, re.compile("Cloud API error 1001: custom error"), True),  # Custom error
+        (None, ConnectionError, re.compile("No response from cloud API"), True),  # Missing response
+    ], indirect=["send_protocol"])
+    def test_send_errors(self, send_protocol, exc, match, reachable):
+        """Test send method error handling.
+        
+        Verifies that send raises TimeoutError for device offline (80001),
+        RuntimeError for other error codes and ConnectionError for no response.
         """
-        protocol._host = "test.host.com"
-        protocol._device_id = "123"
-        protocol._cloud_base._id = 1
-        
-        response = {"code": 80001, "msg": "Device offline"}
-        protocol._cloud_base._api_call = Mock(return_value=response)
-        
-        with pytest.raises(TimeoutError, match="Device offline"):
-            protocol.send("test_method", {"param": "value"})
+        with pytest.raises(exc, match=match):
+            send_protocol.send("test_method", {"param": "value"})
             
-        assert protocol.device_reachable is False
-
-    @pytest.mark.parametrize("error_code,error_message", [
-        (500, "server error"),  # Generic server error
-        (403, "forbidden"),  # Forbidden error
-        (404, "not found"),  # Not found error
-        (1001, "custom error"),  # Custom error
-    ])
-    def test_send_runtime_error_codes(self, protocol, error_code, error_message):
-        """Test send method with various error codes.
-        
-        Verifies that send method throws RuntimeError for non-timeout error codes.
-        """
-        protocol._host = "test.host.com"
-        protocol._device_id = "123"
-        protocol._cloud_base._id = 1
-        
-        response = {"code": error_code, "msg": error_message}
-        protocol._cloud_base._api_call = Mock(return_value=response)
-        
-        with pytest.raises(RuntimeError, match=f"Cloud API error {error_code}: {error_message}"):
-            protocol.send("test_method", {"param": "value"})
+        assert send_protocol.device_reachable is reachable
 
     def test_mqtt_message_updates_reachable(self, protocol):
         """Test that receiving an MQTT message marks device as reachable."""
         protocol._device_reachable = False
         
-        # Create a mock message
-        mock_message = Mock()
-        mock_message.payload = b'{"data": {"some": "data"}}'
+        # Only the payload attribute is read
+        mock_message = SimpleNamespace(payload=b'{"data": {"some": "data"}}')
         
         # Call the static method (need to pass self explicitly as it's static but uses self)
         DreameMowerCloudDevice._on_mqtt_client_message(None, protocol, mock_message)
         
         assert protocol.device_reachable is True
 
-    def test_send_missing_data_field_returns_none(self, protocol):
-        """Test send method with successful response but missing data field.
-        
-        Verifies that send method returns None for successful but empty responses.
-        """
-        protocol._host = "test.host.com"
-        protocol._device_id = "123"
-        protocol._cloud_base._id = 1
-        
-        # Successful response (code=0) but no data field
-        response = {"code": 0}
-        protocol._cloud_base._api_call = Mock(return_value=response)
-        
-        result = protocol.send("test_method", {"param": "value"})
-        assert result is None
-
-    def test_send_missing_result_field_returns_none(self, protocol):
-        """Test send method with successful response but missing result field in data.
-        
-        Verifies that send method returns None for successful but empty results.
-        """
-        protocol._host = "test.host.com"
-        protocol._device_id = "123"
-        protocol._cloud_base._id = 1
-        
-        # Successful response with data but no result field
-        response = {"code": 0, "data": {}}
-        protocol._cloud_base._api_call = Mock(return_value=response)
-        
-        result = protocol.send("test_method", {"param": "value"})
-        assert result is None
-
-    def test_get_batch_device_datas_success(self, protocol):
+    def test_get_batch_device_datas_success(self, protocol, base_connected):
         """Test get_batch_device_datas with successful response."""
         protocol._device_id = "123"
         
-        # Mock the cloud base connected property to return True
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            protocol._cloud_base._api_call = Mock(return_value={
-                "code": 0,
-                "data": {"batch_key": "batch_value"}
-            })
+        protocol._cloud_base._api_call = Mock(return_value={
+            "code": 0,
+            "data": {"batch_key": "batch_value"}
+        })
             
-            result = protocol.get_batch_device_datas(["prop1", "prop2"])
+        result = protocol.get_batch_device_datas(["prop1", "prop2"])
             
-            assert result == {"batch_key": "batch_value"}
+        assert result == {"batch_key": "batch_value"}
 
-    def test_set_batch_device_datas_success(self, protocol):
+    def test_set_batch_device_datas_success(self, protocol, base_connected):
         """Test set_batch_device_datas with successful response."""
         protocol._device_id = "123"
         
-        # Mock the cloud base connected property to return True
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            protocol._cloud_base._api_call = Mock(return_value={
-                "result": {"success": True}
-            })
+        protocol._cloud_base._api_call = Mock(return_value={
+            "result": {"success": True}
+        })
             
-            result = protocol.set_batch_device_datas(["prop1", "prop2"])
+        result = protocol.set_batch_device_datas(["prop1", "prop2"])
             
-            assert result == {"success": True}
+        assert result == {"success": True}
 
-    @patch('custom_components.dreame_mower.dreame.cloud.cloud_device.mqtt_client.Client')
-    def test_connect_success(self, mock_mqtt_client, protocol):
+    def test_connect_success(self, mqtt_client_cls, protocol, base_connected):
         """Test connect method with successful connection."""
-        # Mock the cloud base connected property to return True
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            protocol._initialize_mqtt_connection_state = Mock(return_value=True)
-            protocol._host = "mqtt.test.com:8883"
-            protocol._uid = "test_uid"
-            protocol._refresh_mqtt_credentials = Mock(return_value=True)
+        protocol._initialize_mqtt_connection_state = Mock(return_value=True)
+        protocol._host = "mqtt.test.com:8883"
+        protocol._uid = "test_uid"
+        protocol._refresh_mqtt_credentials = Mock(return_value=True)
             
-            mock_client = Mock()
-            mock_mqtt_client.return_value = mock_client
+        mock_client = Mock()
+        mqtt_client_cls.return_value = mock_client
             
-            message_callback = Mock()
-            connected_callback = Mock()
-            disconnected_callback = Mock()
+        message_callback, connected_callback, disconnected_callback = object(), object(), object()
             
-            result = protocol.connect(message_callback, connected_callback, disconnected_callback)
+        result = protocol.connect(message_callback, connected_callback, disconnected_callback)
 
-            assert result is True
-            assert protocol._mqtt_message_callback == message_callback
-            assert protocol._mqtt_connected_callback == connected_callback
-            assert protocol._mqtt_disconnected_callback == disconnected_callback
-            mock_client.connect.assert_called_once_with("mqtt.test.com", 8883, 50)
+        assert result is True
+        assert protocol._mqtt_message_callback is message_callback
+        assert protocol._mqtt_connected_callback is connected_callback
+        assert protocol._mqtt_disconnected_callback is disconnected_callback
+        mock_client.connect.assert_called_once_with("mqtt.test.com", 8883, 50)
 
     def test_connect_not_logged_in(self, protocol):
         """Test connect method when not logged in."""
-        # Mock the cloud base connected property to return False and connection to fail
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=False):
-            protocol._cloud_base.connect = Mock(return_value=False)
-            # Must provide required callbacks; expect False due to failed login
-            result = protocol.connect(Mock(), Mock(), Mock())
-            assert result is False
-            protocol._cloud_base.connect.assert_called_once()
-
-    def test_connect_no_callbacks_raises(self, protocol):
+        # Cloud base reports not connected and connection fails
+        _set_base_connected(protocol, False)
+        protocol._cloud_base.connect = Mock(return_value=False)
+        # Must provide required callbacks; expect False due to failed login
+        result = protocol.connect(object(), object(), object())
+        assert result is False
+        protocol._cloud_base.connect.assert_called_once()
+
+    def test_connect_no_callbacks_raises(self, protocol, base_connected):
         """connect must raise when required callbacks are missing or None."""
-        with patch('custom_components.dreame_mower.dreame.cloud.cloud_base.DreameMowerCloudBase.connected', new_callable=PropertyMock, return_value=True):
-            protocol._initialize_mqtt_connection_state = Mock(return_value=True)
-            # Missing positional args -> TypeError
-            with pytest.raises(TypeError):
-                protocol.connect()
-            # Passing None explicitly -> ValueError from runtime check
-            with pytest.raises(ValueError):
-                protocol.connect(Mock(), None, Mock())
-
-    def test_disconnect(self, protocol):
+        protocol._initialize_mqtt_connection_state = Mock(return_value=True)
+        # Missing positional args -> TypeError
+        with pytest.raises(TypeError):
+            protocol.connect()
+        # Passing None explicitly -> ValueError from runtime check
+        with pytest.raises(ValueError):
+            protocol.connect(object(), None, object())
+
+    def test_disconnect(self, protocol, mqtt_mock_client):
         """Test disconnect method."""
         protocol._cloud_base.disconnect = Mock()
-        mock_client = Mock()
-        protocol._mqtt_client = mock_client
         protocol._mqtt_client_connected = True
         protocol._mqtt_client_connecting = True
         
         # Set up callbacks to verify they are cleaned up
-        protocol._mqtt_message_callback = Mock()
-        protocol._mqtt_connected_callback = Mock()
-        protocol._mqtt_disconnected_callback = Mock()
+        protocol._mqtt_message_callback = object()
+        protocol._mqtt_connected_callback = object()
+        protocol._mqtt_disconnected_callback = object()
         
         protocol.disconnect()
         
         # Verify MQTT cleanup operations
-        mock_client.loop_stop.assert_called_once()
-        mock_client.disconnect.assert_called_once()
+        mqtt_mock_client.loop_stop.assert_called_once()
+        mqtt_mock_client.disconnect.assert_called_once()
         
         # Verify MQTT state cleanup
         assert protocol._mqtt_client is None
@@ -671,101 +557,78 @@ class TestDreameMowerCloudDevice:
 
     # send_async removed in current implementation; covered in legacy tests
 
-    def test_get_properties(self, protocol):
-        """Test get_properties method."""
-        protocol.send = Mock(return_value={"1.1": "value1"})
+    @pytest.mark.parametrize("method_name,args,expected_send_name,expected_params,expected_retry,return_value", [
+        ("get_properties", (["1.1", "1.2"],), "get_properties", ["1.1", "1.2"], 1, {"1.1": "value1"}),
+        ("set_properties", ([{"siid": 1, "piid": 2, "value": "test"}],), "set_properties",
+         [{"siid": 1, "piid": 2, "value": "test"}], 2, "success"),
+    ])
+    def test_send_dispatch(
+        self, protocol, method_name, args, expected_send_name, expected_params, expected_retry, return_value
+    ):
+        """Test get_properties/set_properties forward to send with their method name and retry count."""
+        protocol.send = _RecordingSend(return_value)
 
-        result = protocol.get_properties(["1.1", "1.2"])
+        result = getattr(protocol, method_name)(*args)
 
-        protocol.send.assert_called_once_with(
-            "get_properties", parameters=["1.1", "1.2"], retry_count=1
-        )
-        assert result == {"1.1": "value1"}
+        assert protocol.send.calls == [
+            ((expected_send_name,), {"parameters": expected_params, "retry_count": expected_retry})
+        ]
+        assert result == return_value
 
-    def test_set_property_dreame_cloud(self, protocol):
+    def test_set_property_dreame_cloud(self, protocol, device_id_patched):
         """Test set_property method with dreame cloud."""
-        with patch.object(type(protocol), 'device_id', new_callable=PropertyMock, return_value="123"):
-            protocol.set_properties = Mock(return_value="success")
-            
-            result = protocol.set_property(1, 2, "test_value")
-            
-            expected_params = [{
-                "did": "123",
-                "siid": 1,
-                "piid": 2,
-                "value": "test_value"
-            }]
-            protocol.set_properties.assert_called_once_with(expected_params, retry_count=2)
-            assert result == "success"
-
-    def test_set_properties(self, protocol):
-        """Test set_properties method."""
-        protocol.send = Mock(return_value="success")
-        
-        params = [{"siid": 1, "piid": 2, "value": "test"}]
-        result = protocol.set_properties(params)
-
-        protocol.send.assert_called_once_with(
-            "set_properties", parameters=params, retry_count=2
-        )
+        protocol.set_properties = _RecordingSend("success")
+
+        result = protocol.set_property(1, 2, "test_value")
+
+        expected_params = [{
+            "did": "123",
+            "siid": 1,
+            "piid": 2,
+            "value": "test_value"
+        }]
+        assert protocol.set_properties.calls == [((expected_params,), {"retry_count": 2})]
         assert result == "success"
 
     # action_async removed in current implementation; covered in legacy tests
 
     # action_async removed in current implementation; covered in legacy tests
 
-    def test_action_dreame_cloud(self, protocol):
-        """Test action method with dreame cloud."""
-        with patch.object(type(protocol), 'device_id', new_callable=PropertyMock, return_value="123"):
-            protocol.send = Mock(return_value="action_result")
-            
-            result = protocol.action(1, 2, ["param1"])
-            
-            expected_params = {
-                "did": "123",
-                "siid": 1,
-                "aiid": 2,
-                "in": ["param1"]
-            }
-            protocol.send.assert_called_once_with(
-                "action", parameters=expected_params, retry_count=2
-            )
-            assert result == "action_result"
-
-    def test_action_none_parameters(self, protocol):
-        """Test action method with None parameters."""
-        with patch.object(type(protocol), 'device_id', new_callable=PropertyMock, return_value="123"):
-            protocol.send = Mock(return_value="action_result")
-            
-            result = protocol.action(1, 2, None)
-            
-            expected_params = {
-                "did": "123",
-                "siid": 1,
-                "aiid": 2,
-                "in": []
-            }
-            protocol.send.assert_called_once_with(
-                "action", parameters=expected_params, retry_count=2
-            )
-            assert result == "action_result"
-
-    def test_action_send_exception(self, protocol):
-        """Test action method when send raises an exception."""
-        with patch.object(type(protocol), 'device_id', new_callable=PropertyMock, return_value="123"):
-            # Test different exception types that should be propagated
-            for exception_type in [TimeoutError, RuntimeError, ConnectionError]:
-                protocol.send = Mock(side_effect=exception_type("Test error"))
-                
-                with pytest.raises(exception_type, match="Test error"):
-                    protocol.action(1, 2, ["param1"])
-                
-                expected_params = {
-                    "did": "123",
-                    "siid": 1,
-                    "aiid": 2,
-                    "in": ["param1"]
-                }
-                protocol.send.assert_called_with(
-                    "action", parameters=expected_params, retry_count=2
-                )
+    @pytest.mark.parametrize("parameters,expected_in", [
+        (["param1"], ["param1"]),
+        (None, []),  # None parameters become an empty list
+    ])
+    def test_action(self, protocol, device_id_patched, parameters, expected_in):
+        """Test action method builds the action payload and forwards it to send."""
+        protocol.send = _RecordingSend("action_result")
+
+        result = protocol.action(1, 2, parameters)
+
+        expected_params = {
+            "did": "123",
+            "siid": 1,
+            "aiid": 2,
+            "in": expected_in
+        }
+        assert protocol.send.calls == [
+            (("action",), {"parameters": expected_params, "retry_count": 2})
+        ]
+        assert result == "action_result"
+
+    @pytest.mark.parametrize("exception_type", [TimeoutError, RuntimeError, ConnectionError])
+    def test_action_send_exception(self, protocol, device_id_patched, exception_type):
+        """Test action method propagates exceptions raised by send."""
+        protocol.send = _RecordingSend(side_effect=exception_type("Test error"))
+
+        with pytest.raises(exception_type, match=_TEST_ERROR_RE):
+            protocol.action(1, 2, ["param1"])
+
+        expected_params = {
+            "did": "123",
+            "siid": 1,
+            "aiid": 2,
+            "in": ["param1"]
+        }
+        assert protocol.send.calls == [
+            (("action",), {"parameters": expected_params, "retry_count": 2})
+        ]
@@ -16,6 +16,18 @@ from custom_components.dreame_mower.dreame.property.device_code import (
 )
 
 
+@pytest.fixture
+def handler():
+    """Fresh base-model device code handler."""
+    return DeviceCodeHandler()
+
+
+@pytest.fixture(scope="module")
+def registries():
+    """Registries resolved once per module for each model under test."""
+    return {m: get_device_code_registry(m) for m in [None, "dreame.mower.p2255", "mova.mower.g2405b", "unknown.model"]}
+
+
 class TestDeviceCodeDefinition:
     """Test cases for DeviceCodeDefinition."""
 
@@ -152,10 +164,8 @@ class TestDeviceCodeHandler:
         (999, True, 999, "Unknown Code 999", False, False),    # Unknown code
         ("invalid", False, None, None, None, None),           # Invalid type
     ])
-    def test_parse_value(self, input_value, expected_success, expected_code, expected_name, expected_error, expected_warning):
+    def test_parse_value(self, handler, input_value, expected_success, expected_code, expected_name, expected_error, expected_warning):
         """Test parsing various device code values."""
-        handler = DeviceCodeHandler()
-        
         result = handler.parse_value(input_value)
         
         assert result == expected_success
@@ -164,9 +174,8 @@ class TestDeviceCodeHandler:
         assert handler.device_code_is_error == expected_error
         assert handler.device_code_is_warning == expected_warning
 
-    def test_get_notification_data(self):
+    def test_get_notification_data(self, handler):
         """Test getting notification data."""
-        handler = DeviceCodeHandler()
         handler.parse_value(28)
         
         notification_data = handler.get_notification_data()
@@ -180,10 +189,8 @@ class TestDeviceCodeHandler:
         assert notification_data[NOTIFICATION_NAME_FIELD] == "BLADES_SEVERELY_WORN"
         assert notification_data[NOTIFICATION_DESCRIPTION_FIELD] == "Blades are severely worn. Replace them soon."
 
-    def test_set_model(self):
+    def test_set_model(self, handler):
         """Test changing device model."""
-        handler = DeviceCodeHandler()
-        
         # Start with base model
         handler.parse_value(0)
         assert handler.device_code_name == "NO_DEVICE_CODE"
@@ -212,9 +219,12 @@ class TestDeviceCodeRegistries:
         ("mova.mower.g2405b", "ROBOT_LIFTED", "BLADES_SEVERELY_WORN"),       # MOVA registry
         ("unknown.model", "NO_DEVICE_CODE", "BLADES_SEVERELY_WORN"),         # Unknown model
     ])
-    def test_get_device_code_registry(self, model, expected_code_0_name, expected_code_28_name):
+    def test_get_device_code_registry(self, registries, model, expected_code_0_name, expected_code_28_name):
         """Test getting registries for different models."""
-        registry = get_device_code_registry(model)
+        registry = registries[model]
+        
+        # Registries are prebuilt; lookups hand back the same instance
+        assert get_device_code_registry(model) is registry
         
         # Code 28 should be available in all registries
         assert registry.get_name(28) == expected_code_28_name
@@ -226,9 +236,8 @@ class TestDeviceCodeRegistries:
 class TestNewBladeWearCode:
     """Specific tests for the new blade wear code 28."""
 
-    def test_blade_wear_code_properties(self):
+    def test_blade_wear_code_properties(self, handler, registries):
         """Test the new blade wear code 28 properties and availability across all registries."""
-        handler = DeviceCodeHandler()
         handler.parse_value(28)
         
         assert handler.device_code == 28
@@ -238,6 +247,5 @@ class TestNewBladeWearCode:
         assert handler.device_code_is_error is False
         
         # Verify available in all model registries
-        for model in [None, "dreame.mower.p2255", "mova.mower.g2405b"]:
-            registry = get_device_code_registry(model)
+        for registry in registries.values():
             assert registry.get_name(28) == "BLADES_SEVERELY_WORN"
\ No newline at end of file